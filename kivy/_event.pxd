@@ -6,4 +6,10 @@ cdef class EventDispatcher(ObjectWithUid):
     cdef dict __properties
     cdef dict __storage
     cdef object __weakref__
+    cdef int __batch_depth
+    cdef list __batch_pending
     cpdef dict properties(self)
+    cdef int _defer_dispatch(self, object prop, object storage)
+    cdef _begin_batch(self)
+    cdef _end_batch(self)
+    cdef _flush_dispatch(self)
@@ -10,6 +10,29 @@ handlers.
     Properties discovering and methods have been moved from
     :class:`~kivy.uix.widget.Widget` to :class:`EventDispatcher`
 
+.. _event-batched-updates:
+
+Batched updates
+---------------
+
+.. versionadded:: 1.8.0
+
+Changing several properties of a widget one after the other dispatches each
+change to the observers as soon as it happens, and the properties depending on
+them (`pos` depends on `x` and `y`) are dispatched each time too. Within
+:meth:`EventDispatcher.batch_update`, the observers are called only once per
+property, with the final value, at the end of the block::
+
+    with widget.batch_update():
+        widget.x = 10
+        widget.y = 10
+        widget.width = 100
+        widget.height = 100
+    # the observers of x, y, pos, width, height, size... are called here
+
+The values are always up to date, only the observers calls are delayed.
+:meth:`EventDispatcher.hold_dispatch` does the same for all the instances at
+once.
 '''
 
 __all__ = ('EventDispatcher', )
@@ -20,6 +43,8 @@ from kivy.weakmethod import WeakMethod
 from kivy.properties cimport Property, PropertyStorage, ObjectProperty
 
 cdef int widget_uid = 0
+cdef int dispatch_hold = 0
+cdef list dispatch_held = []
 cdef dict cache_properties = {}
 cdef dict cache_events = {}
 cdef dict cache_events_handlers = {}
@@ -43,6 +68,41 @@ cdef class ObjectWithUid(object):
         widget_uid += 1
         self.uid = widget_uid
 
+cdef class _BatchUpdate(object):
+    cdef EventDispatcher obj
+
+    def __cinit__(self, EventDispatcher obj):
+        self.obj = obj
+
+    def __enter__(self):
+        self.obj._begin_batch()
+        return self.obj
+
+    def __exit__(self, *largs):
+        self.obj._end_batch()
+
+
+cdef class _HoldDispatch(object):
+
+    def __enter__(self):
+        global dispatch_hold
+        dispatch_hold += 1
+
+    def __exit__(self, *largs):
+        global dispatch_hold, dispatch_held
+        cdef EventDispatcher obj
+        cdef list held
+        dispatch_hold -= 1
+        if dispatch_hold:
+            return
+        held = dispatch_held
+        dispatch_held = []
+        for obj in held:
+            # the instances in their own batch will be flushed at its end
+            if not obj.__batch_depth:
+                obj._flush_dispatch()
+
+
 cdef class EventDispatcher(ObjectWithUid):
     '''Generic event dispatcher interface
 
@@ -71,20 +131,15 @@ cdef class EventDispatcher(ObjectWithUid):
                     continue
                 if k == 'touch_down' or k == 'touch_move' or k == 'touch_up':
                     raise Exception('The property <%s> have a forbidden name' % k)
-                attrs_found[k] = uattr
+                attr = uattr
+                attr._name = k
+                attrs_found[k] = attr
         else:
             attrs_found = cp[__cls__]
 
-        # First loop, link all the properties storage to our instance
-        for k in attrs_found:
-            attr = attrs_found[k]
-            attr.link(self, k)
-
-        # Second loop, resolve all the reference
-        for k in attrs_found:
-            attr = attrs_found[k]
-            attr.link_deps(self, k)
-
+        # The storage of the properties is not created here, but on their
+        # first access (see Property.get_storage()): most of the properties of
+        # an instance are never read, set or bound.
         self.__properties = attrs_found
 
         # Automatic registration of event types (instead of calling
@@ -246,6 +301,34 @@ cdef class EventDispatcher(ObjectWithUid):
                 prop = self.__properties[key]
                 prop.bind(self, value)
 
+    def bind_weak(self, **kwargs):
+        '''Same as :meth:`bind`, but the properties only keep a weak reference
+        to the callbacks that are bound methods. Binding a transient object,
+        like a widget, to a long-lived one doesn't keep the transient object
+        alive: its callbacks are removed once it has been garbage collected::
+
+            class MyScreen(Screen):
+                def __init__(self, **kwargs):
+                    super(MyScreen, self).__init__(**kwargs)
+                    # the app doesn't keep the screen alive
+                    app.bind_weak(title=self.on_app_title)
+
+        The callbacks can be unbound with :meth:`unbind`. The events are
+        always bound with a weak reference, for both :meth:`bind` and
+        :meth:`bind_weak`.
+
+        .. versionadded:: 1.8.0
+        '''
+        cdef Property prop
+        for key, value in kwargs.iteritems():
+            if key[:3] == 'on_':
+                if key not in self.__event_stack:
+                    continue
+                self.__event_stack[key].append(WeakMethod(value))
+            else:
+                prop = self.__properties[key]
+                prop.bind_weak(self, value)
+
     def unbind(self, **kwargs):
         '''Unbind properties from callback functions.
 
@@ -277,7 +360,12 @@ cdef class EventDispatcher(ObjectWithUid):
         '''
         if name[:3] == 'on_':
             return self.__event_stack[name]
-        cdef PropertyStorage ps = self.__storage[name]
+        cdef Property prop = self.__properties[name]
+        cdef PropertyStorage ps = self.__storage.get(name)
+        if ps is None:
+            # the property has never been accessed, so it isn't bound either;
+            # don't create its storage for that.
+            return []
         return ps.observers
 
     def events(EventDispatcher self):
@@ -293,19 +381,85 @@ cdef class EventDispatcher(ObjectWithUid):
         As soon as a handler return True, the dispatching stop
         '''
         cdef list event_stack = self.__event_stack[event_type]
-        cdef object remove = event_stack.remove
-        for value in event_stack[:]:
-            handler = value()
-            if handler is None:
-                # handler have gone, must be removed
-                remove(value)
-                continue
-            if handler(self, *largs):
-                return True
+        # no copy of the handlers list when there is nothing to iterate
+        if event_stack:
+            for value in event_stack[:]:
+                handler = value()
+                if handler is None:
+                    # handler have gone, must be removed
+                    event_stack.remove(value)
+                    continue
+                if handler(self, *largs):
+                    return True
 
         handler = getattr(self, event_type)
         return handler(*largs)
 
+    def batch_update(self):
+        '''Return a context manager delaying the calls to the observers of the
+        properties of this instance until the end of the block. Each changed
+        property is dispatched only once, with its final value. See
+        :ref:`Batched updates <event-batched-updates>`.
+
+        The batches can be nested: the observers are called at the end of the
+        outermost one.
+
+        .. versionadded:: 1.8.0
+        '''
+        return _BatchUpdate(self)
+
+    @staticmethod
+    def hold_dispatch():
+        '''Return a context manager delaying the calls to the observers of the
+        properties of all the instances until the end of the block. Same as
+        :meth:`batch_update`, but for all the instances.
+
+        .. versionadded:: 1.8.0
+        '''
+        return _HoldDispatch()
+
+    cdef int _defer_dispatch(self, object prop, object storage):
+        # record a property to dispatch at the end of the batch, and return
+        # True if the dispatch must be delayed
+        cdef PropertyStorage ps
+        if not self.__batch_depth and not dispatch_hold:
+            return 0
+        ps = <PropertyStorage>storage
+        if ps.deferred:
+            return 1
+        ps.deferred = 1
+        if self.__batch_pending is None:
+            self.__batch_pending = []
+            if dispatch_hold:
+                dispatch_held.append(self)
+        self.__batch_pending.append(prop)
+        return 1
+
+    cdef _begin_batch(self):
+        self.__batch_depth += 1
+
+    cdef _end_batch(self):
+        self.__batch_depth -= 1
+        if self.__batch_depth or self.__batch_pending is None:
+            return
+        if dispatch_hold:
+            dispatch_held.append(self)
+        else:
+            self._flush_dispatch()
+
+    cdef _flush_dispatch(self):
+        cdef list pending = self.__batch_pending
+        cdef Property prop
+        cdef PropertyStorage ps
+        if pending is None:
+            return
+        self.__batch_pending = None
+        for prop in pending:
+            ps = self.__storage[prop._name]
+            ps.deferred = 0
+        for prop in pending:
+            prop.dispatch_deferred(self)
+
     #
     # Properties
     #
@@ -359,12 +513,7 @@ cdef class EventDispatcher(ObjectWithUid):
         if __cls__ in cache_properties:
             return cache_properties[__cls__]
 
-        cdef dict ret, p
-        ret = {}
-        p = self.__properties
-        for x in self.__storage:
-            ret[x] = p[x]
-        return ret
+        return self.__properties.copy()
 
     def create_property(self, name):
         '''Create a new property at runtime.
@@ -43,6 +43,11 @@ A :class:`~kivy.adapters.dictadapter.DictAdapter` is a subclass of a
     an ObjectProperty, so we need to reset it here to ListProperty). See also
     DictAdapter and its set of data = DictProperty().
 
+.. versionchanged:: 1.8.0
+
+    Appending items to :attr:`~ListAdapter.data` keeps the cached views and
+    the selection, instead of resetting them.
+
 '''
 
 __all__ = ('ListAdapter', )
@@ -382,6 +387,13 @@ class ListAdapter(Adapter, EventDispatcher):
     # [TODO] Could easily add select_all() and deselect_all().
 
     def update_for_new_data(self, *args):
+        if len(args) == 2:
+            op = getattr(args[1], 'last_op', None)
+            if (op is not None and op[1] and not op[3] and
+                    op[1] + len(op[2]) == len(args[1])):
+                # items appended to a non-empty list: the cached views and the
+                # selection are still valid.
+                return
         self.delete_cache()
         self.initialize_selection()
 
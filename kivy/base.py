@@ -99,6 +99,7 @@ class EventLoopBase(EventDispatcher):
         self.event_listeners = []
         self.window = None
         self.me_list = []
+        self._frame_idle = False
 
     @property
     def touches(self):
@@ -281,6 +282,9 @@ class EventLoopBase(EventDispatcher):
     def dispatch_input(self):
         '''Called by idle() to read events from input providers, pass event to
         postproc, and dispatch final events.
+
+        .. versionchanged:: 1.8.0
+            Return True if any event have been dispatched.
         '''
 
         # first, aquire input events
@@ -295,8 +299,10 @@ class EventLoopBase(EventDispatcher):
         input_events = self.input_events
         pop = input_events.pop
         post_dispatch_input = self.post_dispatch_input
+        dispatched = bool(input_events)
         while input_events:
             post_dispatch_input(*pop(0))
+        return dispatched
 
     def idle(self):
         '''This function is called every frames. By default :
@@ -305,11 +311,11 @@ class EventLoopBase(EventDispatcher):
         * dispatch on_update + on_draw + on_flip on window
         '''
 
-        # update dt
-        Clock.tick()
+        # update dt, the clock can sleep longer if the last frame was idle
+        Clock.tick(self._frame_idle)
 
         # read and dispatch input from providers
-        self.dispatch_input()
+        has_input = self.dispatch_input()
 
         # flush all the canvas operation
         Builder.sync()
@@ -321,10 +327,15 @@ class EventLoopBase(EventDispatcher):
         Builder.sync()
 
         window = self.window
-        if window and window.canvas.needs_redraw:
+        redraw = window and window.canvas.needs_redraw
+        if redraw:
             window.dispatch('on_draw')
             window.dispatch('on_flip')
 
+        # nothing happened in this frame, don't run the next one before an
+        # event is due
+        self._frame_idle = not (has_input or redraw or self.me_list)
+
         # don't loop if we don't have listeners !
         if len(self.event_listeners) == 0:
             Logger.error('Base: No event listeners have been created')
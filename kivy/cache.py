@@ -22,14 +22,123 @@ of 5 seconds::
 
 If the instance is NULL, the cache may have trash it, because you've
 not used the label since 5 seconds, and you've reach the limit.
+
+.. versionchanged:: 1.8.0
+    The `limit` of a category is now enforced: when a new object is appended
+    to a full category, the least recently used object is evicted. Getting or
+    appending an object marks it as the most recently used. For speed, getting
+    an object doesn't change the order of a category without `limit` or
+    `max_bytes` when no global budget is set: :meth:`Cache.trim` evicts its
+    oldest appended objects first.
+
+Eviction callback
+-----------------
+
+.. versionadded:: 1.8.0
+
+A category can be registered with an `on_evict` callback. It is called with
+the category, the key and the object each time the cache drops an object on
+its own, because the limit was hit or because the object timed out. It is not
+called for :meth:`Cache.remove`. This allows the owner of a category to
+release the resources held by the object immediately::
+
+    def release_texture(category, key, texture):
+        print('texture %s has been evicted' % key)
+
+    Cache.register('mytextures', limit=100, on_evict=release_texture)
+
+.. _cache-memory-budget:
+
+Memory budget
+-------------
+
+.. versionadded:: 1.8.0
+
+Counting objects is not enough when their sizes are very different, like a
+16x16 icon and a 4096x4096 background. A category can be registered with a
+`max_bytes` budget instead of (or in addition to) a `limit`::
+
+    # keep at most 64MB of textures
+    Cache.register('mytextures', max_bytes=64 * 1024 * 1024)
+
+The size of each object is estimated when it is appended: textures count for
+width * height * bytes per pixel, :class:`~kivy.core.image.ImageData` for the
+length of their data, images and labels for the size of their textures. Other
+objects count for 0 bytes.
+
+A global budget, shared by all the categories, can also be set with
+:meth:`Cache.set_max_bytes`. When it is exceeded, the least recently used
+objects of all the categories are evicted first. In both cases, the object
+that has just been appended is never evicted.
+
+Timeout
+-------
+
+.. versionchanged:: 1.8.0
+
+An object is purged when it has not been accessed during its `timeout`. The
+purge happens every second, and only touches the objects that may have
+expired: the cache keeps the objects ordered by expiration time.
+
+The timeout is measured in :class:`~kivy.clock.Clock` time, without the
+duration of the last frame: an object used by the previous frame is never
+purged, even if that frame took longer than the timeout. Previous versions
+were doubling the timeout of the categories after a slow frame; the timeouts
+are not modified anymore.
+
+.. _cache-memory-pressure:
+
+Memory pressure
+---------------
+
+.. versionadded:: 1.8.0
+
+When the system is running low on memory, :meth:`Cache.trim` frees a part of
+all the caches at once, and returns an estimation of the number of bytes
+freed::
+
+    # free half of the cached memory
+    freed = Cache.trim(.5)
+
+The categories with the lowest `priority` are trimmed first, starting with
+their least recently used objects. The other caches of Kivy, which are not
+managed by :class:`Cache` (the extents of the glyphs of the labels, the font
+names, or the rules matching the widgets in :mod:`~kivy.lang`), are cleared
+too. They register themselves with :meth:`Cache.add_trim_callback`.
+
+Statistics
+----------
+
+.. versionadded:: 1.8.0
+
+The cache counts, for each category, the hits and misses of :meth:`Cache.get`,
+the objects appended, and the objects evicted because of the limits or purged
+because of the timeout. They are returned by :meth:`Cache.get_stats`, along
+with the current number of objects and their estimated size::
+
+    >>> Cache.get_stats('kv.texture')
+    {'hits': 120, 'misses': 12, 'inserts': 12, 'evictions': 0,
+     'timeouts': 4, 'objects': 8, 'bytes': 4194304}
+
+The :mod:`~kivy.modules.monitor` module can show them live, with the `cache`
+option.
 '''
 
 __all__ = ('Cache', )
 
 from os import environ
+from collections import OrderedDict
+from heapq import heappush, heappop, heapify
 from kivy.logger import Logger
 from kivy.clock import Clock
 
+# bytes per pixel of the texture color formats, used for size estimation.
+_colorfmt_bpp = {
+    'rgba': 4, 'bgra': 4, 'rgb': 3, 'bgr': 3, 'luminance_alpha': 2,
+    'luminance': 1, 'alpha': 1, 's3tc_dxt1': .5, 's3tc_dxt3': 1,
+    's3tc_dxt5': 1, 'pvrtc_rgb2': .25, 'pvrtc_rgb4': .5,
+    'pvrtc_rgba2': .25, 'pvrtc_rgba4': .5, 'etc1_rgb8': .5}
+
 
 class Cache(object):
     '''See module documentation for more information.
@@ -37,9 +146,17 @@ class Cache(object):
 
     _categories = {}
     _objects = {}
+    _stats = {}
+    _max_bytes = None
+    _bytes = 0
+    _trim_callbacks = []
+    # heap of (deadline, seq, category, key) for the objects with a timeout
+    _expiry = []
+    _expiry_seq = 0
 
     @staticmethod
-    def register(category, limit=None, timeout=None):
+    def register(category, limit=None, timeout=None, on_evict=None,
+                 max_bytes=None, priority=0):
         '''Register a new category in cache, with limit
 
         :Parameters:
@@ -51,13 +168,35 @@ class Cache(object):
             `timeout` : double (optionnal)
                 Time to delete the object when it's not used.
                 if None, no timeout is applied.
+            `on_evict` : callable (optionnal)
+                Function called with (category, key, object) when an object
+                is evicted from the cache, either because the limit is hit or
+                because of the timeout.
+            `max_bytes` : int (optionnal)
+                Maximum memory used by the objects of the cache, in bytes.
+                If None, no memory budget is applied.
+            `priority` : int, default to 0
+                Categories with a lower priority are trimmed first by
+                :meth:`trim`.
+
+        .. versionchanged:: 1.8.0
+            `on_evict`, `max_bytes` and `priority` parameters added.
         '''
+        Cache.remove(category)
         Cache._categories[category] = {
             'limit': limit,
-            'timeout': timeout}
-        Cache._objects[category] = {}
-        Logger.debug('Cache: register <%s> with limit=%s, timeout=%ss' %
-            (category, str(limit), str(timeout)))
+            'timeout': timeout,
+            'on_evict': on_evict,
+            'max_bytes': max_bytes,
+            'priority': priority,
+            'bytes': 0,
+            # the order of use only matters with a limit
+            'lru': limit is not None or max_bytes is not None}
+        Cache._objects[category] = OrderedDict()
+        Cache._stats[category] = Cache._new_stats()
+        Logger.debug('Cache: register <%s> with limit=%s, timeout=%ss, '
+            'max_bytes=%s' % (category, str(limit), str(timeout),
+            str(max_bytes)))
 
     @staticmethod
     def append(category, key, obj, timeout=None):
@@ -82,15 +221,32 @@ class Cache(object):
             Logger.warning('Cache: category <%s> not exist' % category)
             return
         timeout = timeout or cat['timeout']
-        # FIXME: activate purge when limit is hit
-        #limit = cat['limit']
-        #if limit is not None and len(Cache._objects[category]) >= limit:
-        #    Cache._purge_oldest(category)
-        Cache._objects[category][key] = {
+        objects = Cache._objects[category]
+        # the objects are kept from the least to the most recently used:
+        # replacing an object moves it at the end.
+        if key in objects:
+            Cache._pop(category, key)
+        size = Cache._sizeof(obj)
+        item = objects[key] = {
             'object': obj,
             'timeout': timeout,
             'lastaccess': Clock.get_time(),
-            'timestamp': Clock.get_time()}
+            'timestamp': Clock.get_time(),
+            'size': size}
+        if timeout is not None:
+            Cache._push_expiry(category, key, item)
+        Cache._stats[category]['inserts'] += 1
+        cat['bytes'] += size
+        Cache._bytes += size
+        limit = cat['limit']
+        if limit is not None and len(objects) > limit:
+            Cache._purge_oldest(category, len(objects) - limit)
+        max_bytes = cat['max_bytes']
+        while (max_bytes is not None and cat['bytes'] > max_bytes and
+               len(objects) > 1):
+            Cache._evict(category)
+        if Cache._max_bytes is not None and Cache._bytes > Cache._max_bytes:
+            Cache._purge_global(category, key)
 
     @staticmethod
     def get(category, key, default=None):
@@ -105,10 +261,21 @@ class Cache(object):
                 Default value to be returned if key is not found
         '''
         try:
-            Cache._objects[category][key]['lastaccess'] = Clock.get_time()
-            return Cache._objects[category][key]['object']
+            objects = Cache._objects[category]
+            item = objects[key]
         except Exception:
+            stats = Cache._stats.get(category)
+            if stats is not None:
+                stats['misses'] += 1
             return default
+        # mark the object as the most recently used. Moving it in the
+        # OrderedDict is costly, it's only done when something can evict it.
+        if Cache._max_bytes is not None or Cache._categories[category]['lru']:
+            del objects[key]
+            objects[key] = item
+        Cache._stats[category]['hits'] += 1
+        item['lastaccess'] = Clock.get_time()
+        return item['object']
 
     @staticmethod
     def get_timestamp(category, key, default=None):
@@ -156,75 +323,322 @@ class Cache(object):
         '''
         try:
             if key is not None:
-                del Cache._objects[category][key]
+                Cache._pop(category, key)
             else:
-                Cache._objects[category] = {}
+                Cache._objects[category] = OrderedDict()
+                cat = Cache._categories[category]
+                Cache._bytes -= cat['bytes']
+                cat['bytes'] = 0
         except Exception:
             pass
 
     @staticmethod
-    def _purge_oldest(category, maxpurge=1):
-        print('PURGE', category)
-        import heapq
-        heap_list = []
-        for key in Cache._objects[category]:
-            obj = Cache._objects[category][key]
-            if obj['lastaccess'] == obj['timestamp']:
-                continue
-            heapq.heappush(heap_list, (obj['lastaccess'], key))
-            print('<<<', obj['lastaccess'])
-        n = 0
-        while n < maxpurge:
-            try:
-                lastaccess, key = heapq.heappop(heap_list)
-                print('=>', key, lastaccess, Clock.get_time())
-            except Exception:
-                return
-            del Cache._objects[category][key]
+    def set_max_bytes(max_bytes):
+        '''Set the memory budget shared by all the categories, in bytes. If
+        None, no global budget is applied. See :ref:`Memory budget
+        <cache-memory-budget>`.
+
+        .. versionadded:: 1.8.0
+        '''
+        Cache._max_bytes = max_bytes
+        if max_bytes is not None and Cache._bytes > max_bytes:
+            Cache._purge_global()
 
     @staticmethod
-    def _purge_by_timeout(dt):
-        curtime = Clock.get_time()
+    def get_bytes(category=None):
+        '''Return the estimated memory used by the objects of a category, or
+        of all the categories if `category` is None, in bytes.
 
-        for category in Cache._objects:
-            if category not in Cache._categories:
-                continue
-            timeout = Cache._categories[category]['timeout']
-            if timeout is not None and dt > timeout:
-                # XXX got a lag ! that may be because the frame take lot of
-                # time to draw. and the timeout is not adapted to the current
-                # framerate. So, increase the timeout by two.
-                # ie: if the timeout is 1 sec, and framerate go to 0.7, newly
-                # object added will be automaticly trashed.
-                timeout *= 2
-                Cache._categories[category]['timeout'] = timeout
+        .. versionadded:: 1.8.0
+        '''
+        if category is None:
+            return Cache._bytes
+        try:
+            return Cache._categories[category]['bytes']
+        except KeyError:
+            return 0
+
+    @staticmethod
+    def trim(level=1.):
+        '''Free a part of the caches, when the system is running low on
+        memory. See :ref:`Memory pressure <cache-memory-pressure>`.
+
+        :Parameters:
+            `level` : float, default to 1.
+                Part of the cached memory to free, between 0 and 1. With 1,
+                all the caches are emptied. The objects without size
+                estimation are evicted in the same proportion in each
+                category.
+
+        Return an estimation of the number of bytes freed.
+
+        .. versionadded:: 1.8.0
+        '''
+        level = min(1., max(0., level))
+        before = Cache._bytes
+        target = before * (1. - level)
+
+        # evict the objects with a known size, by priority
+        categories = Cache._categories
+        priorities = sorted(set([cat['priority']
+                                 for cat in categories.values()]))
+        for priority in priorities:
+            if Cache._bytes <= target:
+                break
+            Cache._purge_lru(target, [category
+                for category, cat in categories.items()
+                if cat['priority'] == priority])
+
+        # then the objects without size
+        for category, cat in list(categories.items()):
+            objects = Cache._objects[category]
+            if cat['bytes'] or not objects:
                 continue
+            Cache._purge_oldest(category, int(len(objects) * level + .5))
 
-            for key in list(Cache._objects[category].keys())[:]:
-                lastaccess = Cache._objects[category][key]['lastaccess']
-                objtimeout = Cache._objects[category][key]['timeout']
+        freed = before - Cache._bytes
+        for callback in Cache._trim_callbacks[:]:
+            freed += callback(level) or 0
+        Logger.info('Cache: Trimmed with level %.2f, %d bytes freed' %
+                    (level, freed))
+        return freed
 
-                # take the object timeout if available
-                if objtimeout is not None:
-                    timeout = objtimeout
+    @staticmethod
+    def add_trim_callback(callback):
+        '''Add a function called by :meth:`trim` with the trim level. It
+        must free the same share of the memory of a cache not managed by
+        :class:`Cache` (all of it with a level of 1), and return an
+        estimation of the number of bytes freed.
 
-                # no timeout, cancel
-                if timeout is None:
+        .. versionadded:: 1.8.0
+        '''
+        if callback not in Cache._trim_callbacks:
+            Cache._trim_callbacks.append(callback)
+
+    @staticmethod
+    def remove_trim_callback(callback):
+        '''Remove a function added with :meth:`add_trim_callback`.
+
+        .. versionadded:: 1.8.0
+        '''
+        if callback in Cache._trim_callbacks:
+            Cache._trim_callbacks.remove(callback)
+
+    @staticmethod
+    def get_stats(category=None):
+        '''Return the statistics of a category, as a dict with the following
+        keys:
+
+        - `hits`: number of :meth:`get` that found the object
+        - `misses`: number of :meth:`get` that didn't find the object
+        - `inserts`: number of objects appended
+        - `evictions`: number of objects evicted because of the limits
+        - `timeouts`: number of objects purged because of the timeout
+        - `objects`: number of objects currently in the cache
+        - `bytes`: estimated memory used by these objects
+
+        If `category` is None, return a dict of the statistics of all the
+        categories. The returned dicts are copies.
+
+        .. versionadded:: 1.8.0
+        '''
+        if category is None:
+            return dict([(cat, Cache.get_stats(cat))
+                         for cat in Cache._categories])
+        stats = dict(Cache._stats.get(category) or Cache._new_stats())
+        stats['objects'] = len(Cache._objects.get(category, ()))
+        stats['bytes'] = Cache.get_bytes(category)
+        return stats
+
+    @staticmethod
+    def reset_stats():
+        '''Reset the counters of all the categories.
+
+        .. versionadded:: 1.8.0
+        '''
+        for category in Cache._stats:
+            Cache._stats[category] = Cache._new_stats()
+
+    @staticmethod
+    def _new_stats():
+        return {'hits': 0, 'misses': 0, 'inserts': 0, 'evictions': 0,
+                'timeouts': 0}
+
+    @staticmethod
+    def _sizeof(obj):
+        # estimate the memory used by an object. Only the image-like objects
+        # are accounted, without creating anything: the textures of an
+        # image loader are not populated here.
+        if isinstance(obj, type):
+            return 0
+        try:
+            # texture or texture region
+            colorfmt = getattr(obj, 'colorfmt', None)
+            if colorfmt is not None:
+                return int(obj.width * obj.height *
+                           _colorfmt_bpp.get(colorfmt, 4))
+            # image data
+            mipmaps = getattr(obj, 'mipmaps', None)
+            if isinstance(mipmaps, dict):
+                return sum([len(mm[2]) for mm in mipmaps.values()
+                            if mm[2] is not None])
+            # image loader
+            if hasattr(obj, '_data') and hasattr(obj, '_textures'):
+                size = sum([Cache._sizeof(x) for x in obj._data or ()])
+                return size + sum([Cache._sizeof(x)
+                                   for x in obj._textures or ()])
+            # core image (_texture) or core label (texture)
+            texture = getattr(obj, '_texture', None)
+            if texture is None:
+                texture = getattr(obj, 'texture', None)
+            if texture is not None and texture is not obj:
+                return Cache._sizeof(texture)
+        except Exception:
+            pass
+        return 0
+
+    @staticmethod
+    def _pop(category, key=None):
+        # remove an object and update the memory accounting. Without key,
+        # the least recently used object is removed.
+        objects = Cache._objects[category]
+        if key is None:
+            key, item = objects.popitem(last=False)
+        else:
+            item = objects.pop(key)
+        size = item.get('size', 0)
+        if size:
+            Cache._categories[category]['bytes'] -= size
+            Cache._bytes -= size
+        return key, item
+
+    @staticmethod
+    def _recount(category):
+        # recompute the memory accounting of a category, used when the
+        # objects have been replaced directly
+        cat = Cache._categories[category]
+        size = 0
+        for item in Cache._objects[category].values():
+            size += item.get('size', 0)
+        Cache._bytes += size - cat['bytes']
+        cat['bytes'] = size
+
+    @staticmethod
+    def _evict(category, key=None, reason='evictions'):
+        # remove an object and notify the owner of the category
+        key, item = Cache._pop(category, key)
+        Cache._stats[category][reason] += 1
+        on_evict = Cache._categories[category].get('on_evict')
+        if on_evict is not None:
+            on_evict(category, key, item['object'])
+
+    @staticmethod
+    def _purge_oldest(category, maxpurge=1):
+        # evict the least recently used objects
+        objects = Cache._objects[category]
+        while maxpurge > 0 and objects:
+            maxpurge -= 1
+            Cache._evict(category)
+
+    @staticmethod
+    def _purge_global(keep_category=None, keep_key=None):
+        # evict the least recently used objects of all the categories until
+        # the global budget is respected.
+        Cache._purge_lru(Cache._max_bytes, list(Cache._categories.keys()),
+                         keep_category, keep_key)
+
+    @staticmethod
+    def _purge_lru(max_bytes, categories, keep_category=None,
+                   keep_key=None):
+        # evict the least recently used objects of the categories until the
+        # global memory is under max_bytes. The objects are ordered in each
+        # category, so only the first object of each one is compared.
+        all_categories = Cache._categories
+        all_objects = Cache._objects
+        while Cache._bytes > max_bytes:
+            oldest = None
+            for category in categories:
+                if not all_categories[category]['bytes']:
                     continue
+                objects = all_objects[category]
+                key = next(iter(objects))
+                if category == keep_category and key == keep_key:
+                    continue
+                lastaccess = objects[key]['lastaccess']
+                if oldest is None or lastaccess < oldest[0]:
+                    oldest = (lastaccess, category)
+            if oldest is None:
+                break
+            Cache._evict(oldest[1])
 
-                if curtime - lastaccess > timeout:
-                    del Cache._objects[category][key]
+    @staticmethod
+    def _push_expiry(category, key, item):
+        # the heap is not updated when an object is accessed: an entry is
+        # valid as long as the object still has the same sequence number, and
+        # its deadline is checked again when the entry is popped.
+        Cache._expiry_seq += 1
+        item['seq'] = seq = Cache._expiry_seq
+        heappush(Cache._expiry,
+                 (item['lastaccess'] + item['timeout'], seq, category, key))
+
+    @staticmethod
+    def _purge_by_timeout(dt):
+        # ignore the duration of the last frame, in order to not purge the
+        # objects used just before a slow frame.
+        curtime = Clock.get_time() - Clock.frametime
+        heap = Cache._expiry
+        all_objects = Cache._objects
+        while heap and heap[0][0] < curtime:
+            deadline, seq, category, key = heappop(heap)
+            objects = all_objects.get(category)
+            if objects is None:
+                continue
+            item = objects.get(key)
+            if item is None or item.get('seq') != seq:
+                continue
+            if item['lastaccess'] + item['timeout'] < curtime:
+                Cache._evict(category, key, 'timeouts')
+            else:
+                # accessed since the entry was pushed
+                Cache._push_expiry(category, key, item)
+
+        # drop the entries of the removed objects when they are too many
+        count = 0
+        for objects in all_objects.values():
+            count += len(objects)
+        if len(heap) > 2 * count + 1000:
+            Cache._rebuild_expiry()
+
+    @staticmethod
+    def _rebuild_expiry():
+        heap = []
+        for category, objects in Cache._objects.items():
+            for key, item in objects.items():
+                if item['timeout'] is None or 'seq' not in item:
+                    continue
+                heap.append((item['lastaccess'] + item['timeout'],
+                             item['seq'], category, key))
+        heapify(heap)
+        Cache._expiry = heap
 
     @staticmethod
     def print_usage():
-        '''Print the cache usage on the console'''
+        '''Print the cache usage on the console
+
+        .. versionchanged:: 1.8.0
+            The statistics of each category are printed too.
+        '''
         print('Cache usage :')
         for category in Cache._categories:
-            print(' * %s : %d / %s, timeout=%s' % (
+            stats = Cache.get_stats(category)
+            print(' * %s : %d / %s, timeout=%s, %d bytes, %d hits, '
+                  '%d misses, %d evictions, %d timeouts' % (
                 category.capitalize(),
                 len(Cache._objects[category]),
                 str(Cache._categories[category]['limit']),
-                str(Cache._categories[category]['timeout'])))
+                str(Cache._categories[category]['timeout']),
+                stats['bytes'], stats['hits'], stats['misses'],
+                stats['evictions'], stats['timeouts']))
 
 if 'KIVY_DOC_INCLUDE' not in environ:
     # install the schedule clock for purging
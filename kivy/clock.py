@@ -126,6 +126,10 @@ with :func:`Clock.schedule_once`::
     t()
     t()
 
+    # will also run the callback once before the next frame
+    Clock.schedule_once(my_callback, coalesce=True)
+    Clock.schedule_once(my_callback, coalesce=True)
+
 Before triggered events, you may have used this approach in a widget::
 
     def trigger_callback(self, *largs):
@@ -155,9 +159,125 @@ Even if x and y changes within one frame, the callback is only run once.
     :func:`Clock.create_trigger` also has a timeout parameter that behaves
     exactly like :func:`Clock.schedule_once`.
 
+.. _clock-profiling:
+
+Profiling callbacks
+-------------------
+
+.. versionadded:: 1.8.0
+
+If your frames are too slow, you can ask the Clock to measure the time spent
+in each scheduled callback. Profiling is disabled by default, and costs
+nothing when disabled. Activate it with the `clock_profile` token of the
+`kivy` section of the configuration, or at runtime::
+
+    Clock.enable_profiling()
+
+    # later, get the 5 callbacks that took the most time
+    for name, calls, total, maximum in Clock.get_profile(5):
+        print(name, calls, total, maximum)
+
+The statistics are grouped by callback name: the same method of many
+instances counts as a single entry. You can also show them on the screen with
+the :mod:`~kivy.modules.monitor` module.
+
+.. _clock-budgeted:
+
+Budgeted tasks
+--------------
+
+.. versionadded:: 1.8.0
+
+A long job executed in a single callback will drop frames. Instead, you can
+write it as a generator that yields regularly, and let the Clock resume it
+every frame, only while the frame has time left::
+
+    def load_items(items):
+        for item in items:
+            container.add_widget(Label(text=item))
+            yield
+
+    Clock.schedule_budgeted(load_items(items))
+
+    # or limit the task to 4ms per frame
+    Clock.schedule_budgeted(load_items(items), 0.004)
+
+The time left is computed from the `maxfps` frame duration, minus the time
+the last frame has spent after the Clock (input dispatching and drawing). A
+task is resumed at least once per frame, even if the frame is already late.
+The task is removed when the generator is exhausted.
+
+.. _clock-idle:
+
+Idle mode
+---------
+
+.. versionadded:: 1.8.0
+
+By default, the main loop runs at `maxfps` even when nothing happens. If you
+set the `idle_fps` token of the `graphics` section of the configuration, the
+main loop will slow down when a frame had nothing to do (no input, nothing
+redrawn): the Clock then sleeps until the next scheduled event is due, but no
+longer than `1 / idle_fps` seconds so that the inputs are still read. As soon
+as something happens, the main loop goes back to `maxfps`.
+
+While idle, the latency of the first input is up to `1 / idle_fps` seconds.
+
+.. _clock-threads:
+
+Scheduling from threads
+-----------------------
+
+.. versionadded:: 1.8.0
+
+The Clock events are processed in the main thread. When :func:`schedule_once`,
+:func:`schedule_interval`, :func:`unschedule` or a trigger are called from
+another thread, the operation is pushed into a thread-safe queue, and applied
+in the main thread at the next tick.
+
+If you need the result of a call done in the main thread, use
+:func:`Clock.schedule_from_thread`. It returns a :class:`ClockFuture` that you
+can wait for::
+
+    def create_texture(dt):
+        return Texture.create(size=(64, 64))
+
+    # in your thread
+    future = Clock.schedule_from_thread(create_texture)
+    texture = future.result()
+
+The queue is drained once per tick. Only the calls submitted before the
+drain starts are processed: the cost of a tick stays bounded even when the
+threads submit calls faster than the frames are processed.
+
+.. _clock-virtual:
+
+Time source and virtual time
+----------------------------
+
+.. versionadded:: 1.8.0
+
+The Clock reads the current time from `time.time()` (`time.clock()` on
+Windows). You can use another function returning the current time in seconds,
+like a monotonic clock::
+
+    Clock.set_time_source(time.monotonic)
+
+The time of the Clock stays continuous when the source is changed.
+
+For tests and benchmarks, you can also use a virtual time: every tick
+advances the time of exactly `dt` seconds, and the Clock never sleeps. The
+application and its animations run as fast as the CPU allows, and in a
+reproducible way::
+
+    # each frame is 1/60s long, whatever the real time is
+    Clock.enable_virtual_time(1 / 60.)
+
+The time measures (profiling, budgeted tasks) still use the real time.
+
 '''
 
-__all__ = ('Clock', 'ClockBase', 'ClockEvent', 'mainthread')
+__all__ = ('Clock', 'ClockBase', 'ClockEvent', 'ClockFuture', 'mainthread')
 
 from sys import platform
 from os import environ
@@ -165,8 +285,16 @@ from kivy.context import register_context
 from kivy.weakmethod import WeakMethod
 from kivy.config import Config
 from kivy.logger import Logger
+from collections import deque
+from heapq import heappush, heappop
+from threading import Event
 import time
 
+try:
+    from thread import get_ident
+except ImportError:
+    from threading import get_ident
+
 try:
     import ctypes
     if platform in ('win32', 'cygwin'):
@@ -226,8 +354,23 @@ def _hash(cb):
             return 'default'
 
 
+def _callback_name(cb):
+    # readable name of the callback, used for profiling
+    func = getattr(cb, 'func', cb)
+    name = getattr(func, '__name__', None)
+    if name is None:
+        return repr(func)
+    obj = getattr(func, '__self__', None)
+    if obj is not None:
+        return '%s.%s' % (obj.__class__.__name__, name)
+    return '%s.%s' % (getattr(func, '__module__', None), name)
+
+
 class ClockEvent(object):
 
+    __slots__ = ('clock', 'cid', 'loop', 'weak_callback', 'callback',
+                 'timeout', '_is_triggered', '_last_dt', '_dt', '_entry')
+
     def __init__(self, clock, loop, callback, timeout, starttime, cid):
         self.clock = clock
         self.cid = cid
@@ -238,18 +381,16 @@ class ClockEvent(object):
         self._is_triggered = False
         self._last_dt = starttime
         self._dt = 0.
+        # entry of the event in the clock queue, None if not scheduled
+        self._entry = None
 
     def __call__(self, *largs):
         # if the event is not yet triggered, do it !
         if self._is_triggered is False:
             self._is_triggered = True
-            events = self.clock._events
-            cid = self.cid
-            if not cid in events:
-                events[cid] = []
-            events[cid].append(self)
             # update starttime
             self._last_dt = self.clock._last_tick
+            self.clock._schedule_event(self)
             return True
 
     def get_callback(self):
@@ -314,12 +455,101 @@ class ClockEvent(object):
         return '<ClockEvent callback=%r>' % self.get_callback()
 
 
+class ClockFuture(object):
+    '''Handle of a call scheduled with :func:`ClockBase.schedule_from_thread`.
+    The methods can be used from any thread.
+
+    .. versionadded:: 1.8.0
+    '''
+
+    def __init__(self, callback, starttime):
+        self.callback = callback
+        self._starttime = starttime
+        self._done = Event()
+        self._cancelled = False
+        self._result = None
+        self._exception = None
+
+    def __call__(self, curtime):
+        # executed in the main thread
+        if self._cancelled:
+            return
+        callback = self.callback
+        self.callback = None
+        self._result = callback(curtime - self._starttime)
+        self._done.set()
+
+    def set_exception(self, exception):
+        '''Mark the call as done with the `exception` raised by the callback.
+        Used by the clock, :meth:`result` raises it again.
+        '''
+        self._exception = exception
+        self._done.set()
+
+    def cancel(self):
+        '''Cancel the call. Return False if the call is already done.
+        '''
+        if self._done.is_set():
+            return False
+        self._cancelled = True
+        self._done.set()
+        return True
+
+    def cancelled(self):
+        '''Return True if the call have been cancelled.
+        '''
+        return self._cancelled
+
+    def done(self):
+        '''Return True if the call have been executed or cancelled.
+        '''
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        '''Wait for the call to be executed, and return the value returned by
+        the callback. If the callback raised an exception, it's raised again.
+
+        .. warning::
+
+            Never wait from the main thread: the call is executed at the next
+            tick of the main thread.
+        '''
+        self.exception(timeout)
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self, timeout=None):
+        '''Wait for the call to be executed, and return the exception raised
+        by the callback, or None.
+        '''
+        if not self._done.wait(timeout):
+            raise RuntimeError('Timeout while waiting for the callback')
+        if self._cancelled:
+            raise RuntimeError('The callback have been cancelled')
+        return self._exception
+
+    def __repr__(self):
+        return '<ClockFuture done=%r cancelled=%r>' % (
+            self.done(), self._cancelled)
+
+
 class ClockBase(_ClockBase):
     '''A clock object with event support
+
+    .. versionchanged:: 1.8.0
+        Events are kept in a queue ordered by deadline: a tick only touches
+        the events that are due. Events scheduled with a timeout of -1 are
+        kept in a separate FIFO queue.
     '''
     __slots__ = ('_dt', '_last_fps_tick', '_last_tick', '_fps', '_rfps',
                  '_start_tick', '_fps_counter', '_rfps_counter', '_events',
-                 '_max_fps', 'max_iteration')
+                 '_events_heap', '_events_before_frame', '_events_seq',
+                 '_budgeted', '_frame_end', '_draw_time',
+                 '_thread_queue', '_thread_ident', '_max_fps', '_idle_fps',
+                 '_profiling', '_profile', '_time', '_time_offset',
+                 '_virtual_dt', '_frame_start', '_schedule_hook',
+                 'max_iteration')
 
     MIN_SLEEP = 0.005
     SLEEP_UNDERSHOOT = MIN_SLEEP - 0.001
@@ -327,14 +557,25 @@ class ClockBase(_ClockBase):
     def __init__(self):
         super(ClockBase, self).__init__()
         self._dt = 0.0001
-        self._start_tick = self._last_tick = _default_time()
+        self._time = _default_time
+        self._time_offset = 0
+        self._virtual_dt = None
+        self._start_tick = self._last_tick = self._frame_start = self._now()
         self._fps = 0
         self._rfps = 0
         self._fps_counter = 0
         self._rfps_counter = 0
         self._last_fps_tick = None
-        self._events = {}
+        self._frame_end = None
+        self._draw_time = 0
+        # called when something is scheduled from the main thread, used by
+        # the external event loops to wake up before the planned frame
+        self._schedule_hook = None
+        self._clear_events()
         self._max_fps = float(Config.getint('graphics', 'maxfps'))
+        self._idle_fps = float(Config.getint('graphics', 'idle_fps'))
+        self._profile = {}
+        self._profiling = bool(Config.getint('kivy', 'clock_profile'))
 
         #: .. versionadded:: 1.0.5
         #:     When a schedule_once is used with -1, you can add a limit on how
@@ -348,31 +589,42 @@ class ClockBase(_ClockBase):
         '''
         return self._dt
 
-    def tick(self):
+    def tick(self, idle=False):
         '''Advance clock to the next step. Must be called every frame.
-        The default clock have the tick() function called by Kivy'''
+        The default clock have the tick() function called by Kivy
 
-        self._release_references()
-        if self._fps_counter % 100 == 0:
-            self._remove_empty()
+        .. versionchanged:: 1.8.0
+            `idle` parameter added. If True, the last frame had nothing to
+            do, and the clock can sleep until the next event is due. Check
+            :ref:`clock-idle` for more information.
+        '''
+
+        # time spent by the last frame after the clock processing
+        if self._frame_end is not None:
+            self._draw_time = _default_time() - self._frame_end
 
         # do we need to sleep ?
-        if self._max_fps > 0:
+        sleep_until = self._get_sleep_until(idle)
+        if sleep_until is not None:
             min_sleep = self.MIN_SLEEP
             sleep_undershoot = self.SLEEP_UNDERSHOOT
-            fps = self._max_fps
             usleep = self.usleep
 
-            sleeptime = 1 / fps - (_default_time() - self._last_tick)
+            sleeptime = sleep_until - self._now()
             while sleeptime - sleep_undershoot > min_sleep:
                 usleep(1000000 * (sleeptime - sleep_undershoot))
-                sleeptime = 1 / fps - (_default_time() - self._last_tick)
+                sleeptime = sleep_until - self._now()
 
         # tick the current time
-        current = _default_time()
+        if self._virtual_dt is None:
+            current = self._now()
+        else:
+            current = self._last_tick + self._virtual_dt
+        self._frame_start = _default_time()
         self._dt = current - self._last_tick
         self._fps_counter += 1
         self._last_tick = current
+        self._thread_ident = get_ident()
 
         # calculate fps things
         if self._last_fps_tick is None:
@@ -385,11 +637,54 @@ class ClockBase(_ClockBase):
             self._fps_counter = 0
             self._rfps_counter = 0
 
+        # apply the calls made from other threads
+        if self._thread_queue:
+            self._process_thread_queue()
+
         # process event
         self._process_events()
 
+        # resume the budgeted tasks with the time left
+        if self._budgeted:
+            self._process_budgeted()
+
+        self._frame_end = _default_time()
         return self._dt
 
+    def _now(self):
+        # current time of the clock
+        if self._virtual_dt is not None:
+            return self._last_tick
+        return self._time() + self._time_offset
+
+    def _get_sleep_until(self, idle=False):
+        # time until which the next tick must wait, or None
+        if self._virtual_dt is not None:
+            return None
+        sleep_until = None
+        if self._max_fps > 0:
+            sleep_until = self._last_tick + 1 / self._max_fps
+        if idle and self._idle_fps > 0:
+            # sleep until the next event, or the next input poll
+            idle_until = self._last_tick + 1 / self._idle_fps
+            deadline = self.get_next_deadline()
+            if deadline is not None:
+                # the sleep loop can wake up until MIN_SLEEP + undershoot
+                # earlier, but the events are processed 5ms in advance.
+                deadline += self.SLEEP_UNDERSHOOT
+                if deadline < idle_until:
+                    idle_until = deadline
+            if sleep_until is None or idle_until > sleep_until:
+                sleep_until = idle_until
+        return sleep_until
+
+    def _get_sleep_time(self, idle=False):
+        # time to wait before the next tick, used by external event loops
+        sleep_until = self._get_sleep_until(idle)
+        if sleep_until is None:
+            return 0
+        return max(0, sleep_until - self._now())
+
     def tick_draw(self):
         '''Tick the drawing counter
         '''
@@ -418,6 +713,107 @@ class ClockBase(_ClockBase):
         '''Get time in seconds from the application start'''
         return self._last_tick - self._start_tick
 
+    def set_time_source(self, func=None):
+        '''Set the function used to read the current time, in seconds. If
+        None, the default time source is used. The source must follow the
+        real time, as the clock waits for it between the frames. Check
+        :ref:`clock-virtual` for more information.
+
+        .. versionadded:: 1.8.0
+        '''
+        if func is None:
+            func = _default_time
+        now = self._now()
+        self._time = func
+        # keep the time continuous
+        self._time_offset = now - func()
+
+    def enable_virtual_time(self, dt=None):
+        '''Use a virtual time: each tick advances the time of `dt` seconds,
+        and the clock never sleeps. If `dt` is None, the `maxfps` frame
+        duration is used, or 1/60s if `maxfps` is 0. Check
+        :ref:`clock-virtual` for more information.
+
+        .. versionadded:: 1.8.0
+        '''
+        if dt is None:
+            dt = 1. / self._max_fps if self._max_fps > 0 else 1 / 60.
+        if dt <= 0:
+            raise ValueError('dt must be positive, got %s' % dt)
+        self._virtual_dt = dt
+
+    def disable_virtual_time(self):
+        '''Go back to the time source after :func:`enable_virtual_time`. The
+        time continues from the last virtual tick.
+
+        .. versionadded:: 1.8.0
+        '''
+        if self._virtual_dt is None:
+            return
+        self._virtual_dt = None
+        self._time_offset = self._last_tick - self._time()
+
+    def get_next_deadline(self):
+        '''Get the time at which the next scheduled event is due, or None if
+        nothing is scheduled. If something must be done at the next frame
+        (event with a timeout of -1, or budgeted task), the time of the last
+        tick is returned.
+
+        .. versionadded:: 1.8.0
+        '''
+        if self._budgeted:
+            return self._last_tick
+        for entry in self._events_before_frame:
+            if entry[2] is not None:
+                return self._last_tick
+        heap = self._events_heap
+        while heap and heap[0][2] is None:
+            heappop(heap)
+        if heap:
+            return heap[0][0]
+        return None
+
+    def enable_profiling(self):
+        '''Start recording the time spent in each scheduled callback. Check
+        :ref:`clock-profiling` for more information.
+
+        .. versionadded:: 1.8.0
+        '''
+        self._profiling = True
+
+    def disable_profiling(self):
+        '''Stop recording the time spent in the callbacks. The statistics
+        already recorded are kept until :func:`reset_profile` is called.
+
+        .. versionadded:: 1.8.0
+        '''
+        self._profiling = False
+
+    def reset_profile(self):
+        '''Clear the statistics recorded while profiling.
+
+        .. versionadded:: 1.8.0
+        '''
+        self._profile = {}
+
+    def get_profile(self, count=None):
+        '''Return the statistics recorded while profiling, as a list of
+        `(name, calls, total time, max time)` tuples, sorted from the most to
+        the least expensive callback. Times are in seconds.
+
+        :Parameters:
+            `count`: int, defaults to None
+                If set, only return the `count` most expensive callbacks.
+
+        .. versionadded:: 1.8.0
+        '''
+        profile = [(name, stats[0], stats[1], stats[2])
+                   for name, stats in self._profile.items()]
+        profile.sort(key=lambda x: x[2], reverse=True)
+        if count is not None:
+            profile = profile[:count]
+        return profile
+
     def create_trigger(self, callback, timeout=0):
         '''Create a Trigger event. Check module documentation for more
         information.
@@ -429,22 +825,32 @@ class ClockBase(_ClockBase):
         ev.release()
         return ev
 
-    def schedule_once(self, callback, timeout=0):
+    def schedule_once(self, callback, timeout=0, coalesce=False):
         '''Schedule an event in <timeout> seconds.
 
         .. versionchanged:: 1.0.5
             If the timeout is -1, the callback will be called before the next
             frame (at :func:`tick_draw`).
 
+        .. versionchanged:: 1.8.0
+            `coalesce` parameter added. If True and the callback is already
+            pending with the same timeout, the pending event is returned
+            instead of scheduling a new one, like a trigger would do. It's
+            ignored when called from another thread.
         '''
         if not callable(callback):
             raise ValueError('callback must be a callable, got %s' % callback)
         cid = _hash(callback)
+        if coalesce and get_ident() == self._thread_ident:
+            for event in self._events.get(cid, ()):
+                entry = event._entry
+                if (entry is not None and entry[2] is event and
+                        not event.loop and event.timeout == timeout and
+                        event.get_callback() == callback):
+                    return event
         event = ClockEvent(self, False, callback, timeout, self._last_tick, cid)
-        events = self._events
-        if not cid in events:
-            events[cid] = []
-        events[cid].append(event)
+        event.release()
+        self._schedule_event(event)
         return event
 
     def schedule_interval(self, callback, timeout):
@@ -453,59 +859,259 @@ class ClockBase(_ClockBase):
             raise ValueError('callback must be a callable, got %s' % callback)
         cid = _hash(callback)
         event = ClockEvent(self, True, callback, timeout, self._last_tick, cid)
-        events = self._events
-        if not cid in events:
-            events[cid] = []
-        events[cid].append(event)
+        event.release()
+        self._schedule_event(event)
         return event
 
+    def schedule_budgeted(self, generator, budget=None):
+        '''Schedule a generator to be resumed every frame, as long as the
+        frame has time left. Check :ref:`clock-budgeted` for more
+        information.
+
+        :Parameters:
+            `generator`: generator
+                The task to execute, it's resumed until it's exhausted.
+            `budget`: float, defaults to None
+                Maximum time in seconds allowed to the task per frame. If
+                None, the task can use all the time left in the frame.
+
+        .. versionadded:: 1.8.0
+        '''
+        if not hasattr(generator, '__iter__'):
+            raise ValueError('generator must be iterable, got %s' % generator)
+        self._budgeted.append((generator, iter(generator), budget))
+        if self._schedule_hook is not None:
+            self._schedule_hook()
+        return generator
+
+    def unschedule_budgeted(self, generator):
+        '''Remove a task previously scheduled with :func:`schedule_budgeted`.
+
+        .. versionadded:: 1.8.0
+        '''
+        budgeted = self._budgeted
+        for task in list(budgeted):
+            if task[0] is generator:
+                budgeted.remove(task)
+
+    def schedule_from_thread(self, callback):
+        '''Schedule a callback to be called in the main thread at the next
+        tick. This method can be called from any thread. Check
+        :ref:`clock-threads` for more information.
+
+        The callback is called with the time elapsed since the submission.
+        Contrary to the other events, the callback is not weak-referenced: it
+        is kept until it's executed.
+
+        :rtype: :class:`ClockFuture`
+
+        .. versionadded:: 1.8.0
+        '''
+        if not callable(callback):
+            raise ValueError('callback must be a callable, got %s' % callback)
+        future = ClockFuture(callback, self._now())
+        self._thread_queue.append(future)
+        return future
+
     def unschedule(self, callback):
         '''Remove a previously scheduled event.
+
+        .. versionchanged:: 1.8.0
+            When called from another thread, the event is removed at the next
+            tick of the main thread.
         '''
+        if get_ident() != self._thread_ident:
+            self._thread_queue.append(lambda dt: self.unschedule(callback))
+            return
         events = self._events
         if isinstance(callback, ClockEvent):
-            # already done, nothing to schedule
-            if callback.is_done:
+            # already done, nothing to unschedule
+            if callback._entry is None:
                 return
-            cid = callback.cid
-            if cid in events:
-                for event in events[cid][:]:
-                    if event is callback:
-                        events[cid].remove(event)
+            self._cancel_event(callback)
         else:
             cid = _hash(callback)
             if cid in events:
-                for event in events[cid][:]:
+                for event in list(events[cid]):
                     if event.get_callback() == callback:
-                        events[cid].remove(event)
+                        self._cancel_event(event)
 
-    def _release_references(self):
-        # call that function to release all the direct reference to any callback
-        # and replace it with a weakref
+    def _clear_events(self):
+        # sets of events indexed by callback name, used for unscheduling
+        self._events = {}
+        # heap of [deadline, seq, event] entries, for timeout >= 0
+        self._events_heap = []
+        # fifo of [deadline, seq, event] entries, for timeout == -1
+        self._events_before_frame = deque()
+        # fifo of (generator, iterator, budget) tasks
+        self._budgeted = deque()
+        self._events_seq = 0
+        # calls submitted from other threads, deque operations are atomic
+        self._thread_queue = deque()
+        self._thread_ident = get_ident()
+
+    def _schedule_event(self, event):
+        # the queues are only modified in the main thread
+        if get_ident() != self._thread_ident:
+            self._thread_queue.append(lambda dt: self._schedule_event(event))
+            return
+        # add the event to the index if it's not already pending, otherwise
+        # replace its pending entry.
+        if event._entry is None:
+            cid = event.cid
+            events = self._events
+            if cid not in events:
+                events[cid] = set()
+            events[cid].add(event)
+        else:
+            event._entry[2] = None
+        self._push_event(event)
+        if self._schedule_hook is not None:
+            self._schedule_hook()
+
+    def _push_event(self, event):
+        # the sequence number keeps the FIFO order between events having the
+        # same deadline
+        self._events_seq += 1
+        timeout = event.timeout
+        if timeout == -1:
+            entry = [-1, self._events_seq, event]
+            self._events_before_frame.append(entry)
+        else:
+            entry = [event._last_dt + timeout, self._events_seq, event]
+            heappush(self._events_heap, entry)
+        event._entry = entry
+
+    def _cancel_event(self, event):
+        # the entry stays in its queue, and will be skipped when popped.
+        entry = event._entry
+        if entry is not None:
+            entry[2] = None
+            event._entry = None
+        event._is_triggered = False
         events = self._events
-        for cid in list(events.keys())[:]:
-            [x.release() for x in events[cid] if x.callback is not None]
+        cid = event.cid
+        pending = events.get(cid)
+        if pending is None:
+            return
+        pending.discard(event)
+        if not pending:
+            del events[cid]
+
+    def _run_entry(self, entry, curtime):
+        event = entry[2]
+        if event is None:
+            return False
+        # the event is not pending anymore while its callback is running
+        entry[2] = None
+        ret = event.tick(curtime)
+        # the callback may have unscheduled or rescheduled the event.
+        if event._entry is not entry:
+            return True
+        if ret is False:
+            self._cancel_event(event)
+        else:
+            self._push_event(event)
+        return True
 
-    def _remove_empty(self):
-        # remove empty entry in the event list
-        events = self._events
-        for cid in list(events.keys())[:]:
-            if not events[cid]:
-                del events[cid]
+    def _run_entry_profiled(self, entry, curtime):
+        event = entry[2]
+        if event is None:
+            return False
+        callback = event.get_callback()
+        if callback is None:
+            return self._run_entry(entry, curtime)
+        start = _default_time()
+        ret = self._run_entry(entry, curtime)
+        elapsed = _default_time() - start
+        name = _callback_name(callback)
+        stats = self._profile.get(name)
+        if stats is None:
+            self._profile[name] = [1, elapsed, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+        return ret
 
     def _process_events(self):
-        events = self._events
-        for cid in list(events.keys())[:]:
-            for event in events[cid][:]:
-                if event.tick(self._last_tick) is False:
-                    # event may be already removed by the callback
-                    if event in events[cid]:
-                        events[cid].remove(event)
+        curtime = self._last_tick
+        before_frame = self._events_before_frame
+        heap = self._events_heap
+
+        # collect the due events first, then run them: events scheduled from
+        # a callback will be processed at the next tick.
+        due = list(before_frame)
+        before_frame.clear()
+        while heap and curtime - heap[0][0] >= -0.005:
+            entry = heappop(heap)
+            if entry[2] is not None:
+                due.append(entry)
+
+        if self._profiling:
+            run_entry = self._run_entry_profiled
+        else:
+            run_entry = self._run_entry
+        for entry in due:
+            run_entry(entry, curtime)
+
+    def _process_thread_queue(self):
+        # only process the calls that are already submitted, the new ones will
+        # be processed at the next tick
+        queue = self._thread_queue
+        popleft = queue.popleft
+        curtime = self._last_tick
+        for x in range(len(queue)):
+            entry = popleft()
+            # a failing call doesn't delay the next ones
+            try:
+                entry(curtime)
+            except Exception as e:
+                Logger.exception('Clock: Exception in %r scheduled from a '
+                                 'thread' % entry)
+                if isinstance(entry, ClockFuture):
+                    entry.set_exception(e)
+
+    def _process_budgeted(self):
+        tasks = self._budgeted
+        now = _default_time()
+        deadline = None
+        if self._max_fps > 0:
+            deadline = (self._frame_start + 1. / self._max_fps -
+                        self._draw_time)
+
+        # tasks are resumed in a round-robin way, the first one is always
+        # resumed to ensure the progress, even if the frame is late.
+        resumed = False
+        for x in range(len(tasks)):
+            if resumed and deadline is not None and now >= deadline:
+                break
+            task = tasks.popleft()
+            iterator, budget = task[1], task[2]
+            limit = deadline
+            if budget is not None and (limit is None or now + budget < limit):
+                limit = now + budget
+            try:
+                while True:
+                    next(iterator)
+                    resumed = True
+                    now = _default_time()
+                    if limit is None or now >= limit:
+                        break
+            except StopIteration:
+                continue
+            tasks.append(task)
 
     def _process_events_before_frame(self):
         found = True
         count = self.max_iteration
-        events = self._events
+        before_frame = self._events_before_frame
+        popleft = before_frame.popleft
+        if self._profiling:
+            run_entry = self._run_entry_profiled
+        else:
+            run_entry = self._run_entry
         while found:
             count -= 1
             if count == -1:
@@ -514,17 +1120,12 @@ class ClockBase(_ClockBase):
                                 ' the Clock.max_iteration attribute')
                 break
 
-            # search event that have timeout = -1
+            # process the event that have timeout = -1, the ones added by the
+            # callbacks will be processed in the next iteration
             found = False
-            for cid in list(events.keys())[:]:
-                for event in events[cid][:]:
-                    if event.timeout != -1:
-                        continue
+            for x in range(len(before_frame)):
+                if run_entry(popleft(), self._last_tick):
                     found = True
-                    if event.tick(self._last_tick) is False:
-                        # event may be already removed by the callback
-                        if event in events[cid]:
-                            events[cid].remove(event)
 
 def mainthread(func):
     '''Decorator that will schedule the call of the function in the mainthread.
@@ -533,7 +1134,7 @@ def mainthread(func):
     a thread.
 
     Please note that this method will return directly, and no result can be
-    fetched::
+    fetched (use :func:`ClockBase.schedule_from_thread` for that)::
 
         @mainthread
         def callback(self, *args):
@@ -58,6 +58,17 @@ Available configuration tokens
     `window_icon`: string
         Path of the window icon. Use this if you want to replace the default
         pygame icon.
+    `clock_profile`: (0, 1)
+        Record the time spent in every callback scheduled on the
+        :class:`~kivy.clock.Clock`. See :ref:`clock-profiling`.
+    `image_disk_cache`: (0, 1)
+        Keep the decoded images in files on disk, in the `cache/images`
+        directory of the Kivy home directory, and read them back to not
+        decode them again at the next launch. See :ref:`image-disk-cache`.
+    `kv_disk_cache`: (0, 1)
+        Keep the parsed kv files on disk, in the `cache/kv` directory of the
+        Kivy home directory, to not parse them again at the next launch. See
+        :ref:`kv-disk-cache`.
 
 :postproc:
 
@@ -94,6 +105,9 @@ Available configuration tokens
 
     `maxfps`: int, default to 60
         Maximum FPS allowed.
+    `idle_fps`: int, default to 0
+        If set, the main loop slows down to this FPS when nothing happens,
+        and wakes up for the next scheduled event. See :ref:`clock-idle`.
     `fullscreen`: (0, 1, fake, auto)
         Activate fullscreen. If set to `1`, a resolution of `width`
         times `height` pixels will be used.
@@ -179,8 +193,9 @@ Available configuration tokens
 
 .. versionchanged:: 1.8.0
     `systemanddock` and `systemandmulti` has been added as possible value for
-    `keyboard_mode` in kivy section. `exit_on_escape` has been added in the
-    kivy section.
+    `keyboard_mode` in kivy section. `exit_on_escape`, `clock_profile`,
+    `image_disk_cache` and `kv_disk_cache` have been added in the kivy
+    section. `idle_fps` has been added in the graphics section.
 
 .. versionchanged:: 1.2.0
     `resizable` has been added to graphics section
@@ -215,7 +230,7 @@ from kivy.compat import PY2, string_types
 _is_rpi = exists('/opt/vc/include/bcm_host.h')
 
 # Version number of current configuration format
-KIVY_CONFIG_VERSION = 10
+KIVY_CONFIG_VERSION = 14
 
 #: Kivy configuration object
 Config = None
@@ -504,6 +519,18 @@ if not environ.get('KIVY_DOC_INCLUDE'):
         elif version == 9:
             Config.setdefault('kivy', 'exit_on_escape', '1')
 
+        elif version == 10:
+            Config.setdefault('kivy', 'clock_profile', '0')
+
+        elif version == 11:
+            Config.setdefault('graphics', 'idle_fps', '0')
+
+        elif version == 12:
+            Config.setdefault('kivy', 'image_disk_cache', '0')
+
+        elif version == 13:
+            Config.setdefault('kivy', 'kv_disk_cache', '0')
+
         #elif version == 1:
         #   # add here the command for upgrading from configuration 0 to 1
         #
@@ -9,9 +9,33 @@ memory for further access.
 .. note::
 
     Saving an image is not yet supported.
+
+.. _image-disk-cache:
+
+Disk cache
+----------
+
+.. versionadded:: 1.8.0
+
+Decoding the images can take most of the startup time of an application on
+slow devices. The decoded images can be kept in files on disk, and read back
+at the next launch instead of being decoded again. The pixels are read into
+new buffers: the texture upload needs them in memory, they are not shared
+with the file. The cache is activated with the `image_disk_cache` token of
+the configuration, or with::
+
+    from kivy.core.image import ImageDiskCache
+    ImageDiskCache.enable()
+
+The images are stored in the `cache/images` directory of the Kivy home
+directory, unless another directory is given to :meth:`ImageDiskCache.enable`.
+An entry is identified by the path, the modification time and the size of the
+image file, the loader used and the options of the load that change the
+decoded image: a modified image is decoded again. Only the local files are
+cached, not the zip files, atlas or urls.
 '''
 
-__all__ = ('Image', 'ImageLoader', 'ImageData')
+__all__ = ('Image', 'ImageLoader', 'ImageData', 'ImageDiskCache')
 
 from kivy.event import EventDispatcher
 from kivy.core import core_register_libs
@@ -22,7 +46,14 @@ from kivy.atlas import Atlas
 from kivy.resources import resource_find
 from kivy.utils import platform
 from kivy.compat import string_types
+from kivy.config import Config
+from os import stat, remove, rename, makedirs, listdir, fdopen
+from os.path import join, exists, abspath
+from hashlib import sha1
+from tempfile import mkstemp
 import zipfile
+import json
+import struct
 try:
     import io as SIO
 except ImportError:
@@ -245,6 +276,172 @@ class ImageLoaderBase(object):
         return self._nocache
 
 
+class ImageLoaderDiskCache(ImageLoaderBase):
+    '''Loader of the images read from the :class:`ImageDiskCache`.
+
+    .. versionadded:: 1.8.0
+    '''
+
+    def __init__(self, filename, data, **kwargs):
+        self._cached_data = data
+        super(ImageLoaderDiskCache, self).__init__(filename, **kwargs)
+
+    def load(self, filename):
+        data = self._cached_data
+        self._cached_data = None
+        return data
+
+
+class ImageDiskCache(object):
+    '''Disk cache of the decoded images. See :ref:`image-disk-cache`.
+
+    .. versionadded:: 1.8.0
+    '''
+
+    #: Directory of the cache, None if the cache is disabled.
+    directory = None
+
+    MAGIC = b'KVIMG1'
+
+    @staticmethod
+    def enable(directory=None):
+        '''Activate the disk cache. If `directory` is None, the
+        `cache/images` directory of the Kivy home directory is used.
+        '''
+        if directory is None:
+            from kivy import kivy_home_dir
+            directory = join(kivy_home_dir, 'cache', 'images')
+        try:
+            if not exists(directory):
+                makedirs(directory)
+        except OSError as e:
+            Logger.warning('Image: Unable to create the disk cache '
+                           'directory <%s>: %s' % (directory, e))
+            return
+        ImageDiskCache.directory = directory
+
+    @staticmethod
+    def disable():
+        '''Deactivate the disk cache. The cached files are kept.
+        '''
+        ImageDiskCache.directory = None
+
+    @staticmethod
+    def clear():
+        '''Remove all the images stored in the disk cache.
+        '''
+        directory = ImageDiskCache.directory
+        if directory is None:
+            return
+        for fn in listdir(directory):
+            if fn.endswith('.kvimg'):
+                try:
+                    remove(join(directory, fn))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def load(loader, filename, kwargs):
+        '''Load an image with the `loader`, through the disk cache.
+        '''
+        cachefn = ImageDiskCache._get_cache_filename(loader, filename, kwargs)
+        if cachefn is None:
+            return loader(filename, **kwargs)
+        if exists(cachefn):
+            data = ImageDiskCache._read(cachefn, filename)
+            if data is not None:
+                Logger.debug('Image: Load <%s> from the disk cache' %
+                             filename)
+                return ImageLoaderDiskCache(filename, data, **kwargs)
+        im = loader(filename, **kwargs)
+        ImageDiskCache._write(cachefn, im._data)
+        return im
+
+    @staticmethod
+    def _get_cache_filename(loader, filename, kwargs):
+        try:
+            st = stat(filename)
+        except (OSError, TypeError):
+            return None
+        # keep_data and nocache don't change the decoded image
+        options = sorted([(k, v) for k, v in kwargs.items()
+                          if k not in ('keep_data', 'nocache')])
+        key = '%s|%r|%d|%s|%r' % (abspath(filename), st.st_mtime,
+                                  st.st_size, loader.__name__, options)
+        if not isinstance(key, bytes):
+            key = key.encode('utf8')
+        return join(ImageDiskCache.directory,
+                    sha1(key).hexdigest() + '.kvimg')
+
+    @staticmethod
+    def _read(cachefn, filename):
+        # file format: magic, header size, json header, then the pixels of
+        # each mipmap of each image.
+        magic = ImageDiskCache.MAGIC
+        try:
+            with open(cachefn, 'rb') as fd:
+                if fd.read(len(magic)) != magic:
+                    raise ValueError('invalid magic')
+                size = struct.unpack('<I', fd.read(4))[0]
+                header = json.loads(fd.read(size).decode('utf8'))
+                data = []
+                for fmt, flip_vertical, mipmaps in header:
+                    im = None
+                    for level, width, height, size in mipmaps:
+                        pixels = fd.read(size)
+                        if len(pixels) != size:
+                            raise ValueError('truncated file')
+                        if im is None:
+                            im = ImageData(width, height, str(fmt), pixels,
+                                           source=filename,
+                                           flip_vertical=flip_vertical)
+                        else:
+                            im.add_mipmap(level, width, height, pixels)
+                    data.append(im)
+                return data
+        except Exception as e:
+            Logger.warning('Image: Invalid disk cache entry for <%s>: %s' %
+                           (filename, e))
+            try:
+                remove(cachefn)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _write(cachefn, data):
+        header = []
+        blobs = []
+        for im in data:
+            mipmaps = []
+            for level in sorted(im.mipmaps):
+                width, height, pixels = im.mipmaps[level][:3]
+                if not isinstance(pixels, (bytes, bytearray)):
+                    # data not available or not a plain buffer
+                    return
+                mipmaps.append((level, width, height, len(pixels)))
+                blobs.append(pixels)
+            header.append((im.fmt, im.flip_vertical, mipmaps))
+        header = json.dumps(header).encode('utf8')
+
+        # write in a temporary file first, in case another thread or
+        # application is reading the same entry.
+        tmpfn = None
+        try:
+            fd, tmpfn = mkstemp(dir=ImageDiskCache.directory)
+            with fdopen(fd, 'wb') as fp:
+                fp.write(ImageDiskCache.MAGIC)
+                fp.write(struct.pack('<I', len(header)))
+                fp.write(header)
+                for pixels in blobs:
+                    fp.write(pixels)
+            rename(tmpfn, cachefn)
+        except (OSError, IOError) as e:
+            Logger.warning('Image: Unable to write the disk cache entry '
+                           '<%s>: %s' % (cachefn, e))
+            if tmpfn is not None and exists(tmpfn):
+                remove(tmpfn)
+
+
 class ImageLoader(object):
 
     loaders = []
@@ -366,7 +563,10 @@ class ImageLoader(object):
                     continue
                 Logger.debug('Image%s: Load <%s>' %
                         (loader.__name__[11:], filename))
-                im = loader(filename, **kwargs)
+                if ImageDiskCache.directory is not None:
+                    im = ImageDiskCache.load(loader, filename, kwargs)
+                else:
+                    im = loader(filename, **kwargs)
                 break
             if im is None:
                 raise Exception('Unknown <%s> type, no loader found.' % ext)
@@ -793,6 +993,9 @@ image_libs += [
     ('gif', 'img_gif')]
 core_register_libs('image', image_libs)
 
+if Config.getint('kivy', 'image_disk_cache'):
+    ImageDiskCache.enable()
+
 # resolve binding.
 from kivy.graphics.texture import Texture, TextureRegion
 
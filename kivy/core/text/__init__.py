@@ -17,7 +17,9 @@ __all__ = ('LabelBase', 'Label')
 
 import re
 import os
+from sys import getsizeof
 from kivy import kivy_data_dir
+from kivy.cache import Cache
 from kivy.graphics.texture import Texture
 from kivy.core import core_select_lib
 from kivy.resources import resource_find
@@ -520,6 +522,23 @@ class LabelBase(object):
     usersize = property(_get_text_size, _set_text_size,
         doc='''(deprecated) Use text_size instead.''')
 
+def _trim_cache(level):
+    # the glyph extents and the resolved font names are computed again when
+    # needed. The same share of the fonts is forgotten in both caches. See
+    # Cache.trim().
+    freed = 0
+    cache_glyphs = LabelBase._cache_glyphs
+    for fontid in list(cache_glyphs)[:int(len(cache_glyphs) * level + .5)]:
+        glyphs = cache_glyphs.pop(fontid)
+        freed += getsizeof(glyphs)
+        freed += sum([getsizeof(x) for x in glyphs.values()])
+    fonts_cache = LabelBase._fonts_cache
+    for fontname in list(fonts_cache)[:int(len(fonts_cache) * level + .5)]:
+        freed += getsizeof(fonts_cache.pop(fontname))
+    return freed
+
+Cache.add_trim_callback(_trim_cache)
+
 # Load the appropriate provider
 Label = core_select_lib('text', (
     ('pygame', 'text_pygame', 'LabelPygame'),
@@ -605,26 +605,54 @@ Set a key that will be available anywhere in the kv. For example:
         canvas:
             Color:
                 rgb: my_color if self.state == 'normal' else my_color_hl
+
+.. _kv-disk-cache:
+
+Disk cache
+----------
+
+.. versionadded:: 1.8.0
+
+Parsing and compiling the kv files, including the `style.kv` of Kivy, takes a
+noticeable part of the startup time on slow devices. The result of the parsing
+can be kept on disk, and read back at the next launch instead of parsing the
+files again. The cache is activated with the `kv_disk_cache` token of the
+configuration, or with::
+
+    from kivy.lang import ParserDiskCache
+    ParserDiskCache.enable()
+
+The parsed files are stored in the `cache/kv` directory of the Kivy home
+directory, unless another directory is given to
+:meth:`ParserDiskCache.enable`. An entry is identified by the path, the
+modification time and the size of the kv file, and by the versions of Kivy and
+Python. Only the files loaded with :meth:`BuilderBase.load_file` are cached.
+The directives of the files are still executed at each load.
 '''
 
 __all__ = ('Builder', 'BuilderBase', 'BuilderException',
-           'Parser', 'ParserException')
+           'Parser', 'ParserException', 'ParserDiskCache', 'CompiledRule')
 
 import codecs
+import marshal
 import re
 import sys
+from hashlib import sha1
 from re import sub, findall
-from os import environ
-from os.path import join
+from os import environ, fdopen, listdir, makedirs, remove, rename, stat
+from os.path import abspath, exists, join
+from tempfile import mkstemp
 from copy import copy
 from types import CodeType
 from functools import partial
+from operator import itemgetter
 from collections import OrderedDict
+from kivy.config import Config
 from kivy.factory import Factory
 from kivy.logger import Logger
 from kivy.utils import QueryDict
 from kivy.cache import Cache
-from kivy import kivy_data_dir, require
+from kivy import kivy_data_dir, require, __version__
 from kivy.compat import PY2, iteritems, iterkeys
 from kivy.context import register_context
 import kivy.metrics as Metrics
@@ -632,10 +660,22 @@ import kivy.metrics as Metrics
 
 trace = Logger.trace
 global_idmap = {}
+# globals of the compiled kv expressions, refreshed from global_idmap. exec()
+# adds __builtins__ to its globals, global_idmap must not be modified.
+_expression_globals = {}
 
 # late import
 Instruction = None
 
+
+def _code_names(code):
+    # return the global names used by the code, and its nested code
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if type(const) is CodeType:
+            names.update(_code_names(const))
+    return names
+
 # register cache for creating new classtype (template)
 Cache.register('kv.lang')
 
@@ -647,6 +687,7 @@ lang_tr = re.compile('(_\()')
 
 # delayed calls are canvas expression triggered during an loop
 _delayed_calls = []
+_delayed_stats = {'syncs': 0, 'calls': 0, 'coalesced': 0}
 
 # all the widget handlers, used to correctly unbind all the callbacks then the
 # widget is deleted
@@ -743,7 +784,7 @@ class ParserRuleProperty(object):
     '''
 
     __slots__ = ('ctx', 'line', 'name', 'value', 'co_value',
-                 'watched_keys', 'mode', 'count')
+                 'watched_keys', 'mode', 'count', 'co_names', 'co_factories')
 
     def __init__(self, ctx, line, name, value):
         super(ParserRuleProperty, self).__init__()
@@ -763,6 +804,10 @@ class ParserRuleProperty(object):
         self.watched_keys = None
         #: Stats
         self.count = 0
+        #: Names used by the compiled value
+        self.co_names = None
+        #: Functions creating the expressions, per local names
+        self.co_factories = None
 
     def precompile(self):
         name = self.name
@@ -803,6 +848,38 @@ class ParserRuleProperty(object):
             else:
                 self.watched_keys = [['_']]
 
+    def create_expression(self, proxy, ids):
+        '''(internal) Return a function evaluating the compiled value for the
+        widget `proxy`, with the `ids` of its rule.
+
+        The value is compiled once per set of ids used, as a lambda enclosed
+        in a function taking the widget and the ids as arguments. The names
+        that are not ids are read from a copy of :data:`global_idmap`, which
+        has the priority.
+        '''
+        names = self.co_names
+        if names is None:
+            names = _code_names(self.co_value)
+            names.discard('self')
+            names = self.co_names = tuple(sorted(names))
+        local_names = tuple([x for x in names
+                             if x in ids and x not in global_idmap])
+        factories = self.co_factories
+        if factories is None:
+            factories = self.co_factories = {}
+        factory = factories.get(local_names)
+        if factory is None:
+            # keep the line of the value in the kv file for the tracebacks
+            source = 'def _kv_factory(%s): return lambda *_kvargs: (' % (
+                ', '.join(('self', ) + local_names))
+            source += '\n' * self.line + self.value + '\n)'
+            code = compile(source, self.ctx.filename or '<string>', 'exec')
+            namespace = {}
+            _expression_globals.update(global_idmap)
+            exec(code, _expression_globals, namespace)
+            factory = factories[local_names] = namespace['_kv_factory']
+        return factory(proxy, *[ids[x] for x in local_names])
+
     def __repr__(self):
         return '<ParserRuleProperty name=%r filename=%s:%d ' \
                'value=%r watched_keys=%r>' % (
@@ -1036,6 +1113,8 @@ class Parser(object):
                                           package)
             else:
                 raise ParserException(self, ln, 'Unknown directive')
+        # the expressions already compiled see the new names
+        _expression_globals.update(global_idmap)
 
     def parse(self, content):
         '''Parse the contents of a Parser file and return a list
@@ -1227,6 +1306,200 @@ class Parser(object):
         return objects, []
 
 
+class ParserDiskCache(object):
+    '''Disk cache of the parsed kv files. See :ref:`kv-disk-cache`.
+
+    .. versionadded:: 1.8.0
+    '''
+
+    #: Directory of the cache, None if the cache is disabled.
+    directory = None
+
+    MAGIC = b'KVLANG1'
+
+    @staticmethod
+    def enable(directory=None):
+        '''Activate the disk cache. If `directory` is None, the `cache/kv`
+        directory of the Kivy home directory is used.
+        '''
+        if directory is None:
+            from kivy import kivy_home_dir
+            directory = join(kivy_home_dir, 'cache', 'kv')
+        try:
+            if not exists(directory):
+                makedirs(directory)
+        except OSError as e:
+            Logger.warning('Builder: Unable to create the disk cache '
+                           'directory <%s>: %s' % (directory, e))
+            return
+        ParserDiskCache.directory = directory
+
+    @staticmethod
+    def disable():
+        '''Deactivate the disk cache. The cached files are kept.
+        '''
+        ParserDiskCache.directory = None
+
+    @staticmethod
+    def clear():
+        '''Remove all the files stored in the disk cache.
+        '''
+        directory = ParserDiskCache.directory
+        if directory is None:
+            return
+        for fn in listdir(directory):
+            if fn.endswith('.kvc'):
+                try:
+                    remove(join(directory, fn))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def load(filename, read):
+        '''Return the :class:`Parser` of the kv file `filename`, from the
+        disk cache if possible. Otherwise the file content returned by
+        `read(filename)` is parsed, and stored in the cache.
+        '''
+        cachefn = ParserDiskCache._get_cache_filename(filename)
+        if cachefn is not None and exists(cachefn):
+            parser = ParserDiskCache._read(cachefn, filename)
+            if parser is not None:
+                if __debug__:
+                    trace('Builder: load %s from the disk cache' % filename)
+                return parser
+        parser = Parser(content=read(filename), filename=filename)
+        if cachefn is not None:
+            ParserDiskCache._write(cachefn, parser)
+        return parser
+
+    @staticmethod
+    def _get_cache_filename(filename):
+        try:
+            st = stat(filename)
+        except OSError:
+            return None
+        # the code objects can only be read by the same python version
+        key = '%s|%r|%d|%s|%s' % (abspath(filename), st.st_mtime,
+                                  st.st_size, __version__, sys.version)
+        if not isinstance(key, bytes):
+            key = key.encode('utf8')
+        return join(ParserDiskCache.directory,
+                    sha1(key).hexdigest() + '.kvc')
+
+    @staticmethod
+    def _dump_property(prop):
+        return (prop.line, prop.name, prop.value, prop.co_value, prop.mode,
+                prop.watched_keys)
+
+    @staticmethod
+    def _dump_rule(rule):
+        dump_property = ParserDiskCache._dump_property
+        dump_rule = ParserDiskCache._dump_rule
+        canvas = [dump_rule(x) if x is not None else None for x in (
+            rule.canvas_before, rule.canvas_root, rule.canvas_after)]
+        return (rule.line, rule.name, rule.level, rule.id,
+                rule.avoid_previous_rules,
+                [dump_property(x) for x in rule.properties.values()],
+                [dump_property(x) for x in rule.handlers],
+                [dump_rule(x) for x in rule.children], canvas)
+
+    @staticmethod
+    def _load_property(ctx, data):
+        line, name, value, co_value, mode, watched_keys = data
+        prop = ParserRuleProperty(ctx, line, name, value)
+        prop.co_value = co_value
+        prop.mode = mode
+        prop.watched_keys = watched_keys
+        return prop
+
+    @staticmethod
+    def _load_rule(ctx, data):
+        load_property = ParserDiskCache._load_property
+        load_rule = ParserDiskCache._load_rule
+        (line, name, level, rule_id, avoid_previous_rules, properties,
+         handlers, children, canvas) = data
+        # creating the rule registers its selectors in the parser, in the
+        # same order as the parsing did.
+        rule = ParserRule(ctx, line, name, level)
+        rule.id = rule_id
+        rule.avoid_previous_rules = avoid_previous_rules
+        for x in properties:
+            prop = load_property(ctx, x)
+            rule.properties[prop.name] = prop
+        rule.handlers = [load_property(ctx, x) for x in handlers]
+        rule.children = [load_rule(ctx, x) for x in children]
+        rule.canvas_before, rule.canvas_root, rule.canvas_after = [
+            load_rule(ctx, x) if x is not None else None for x in canvas]
+        return rule
+
+    @staticmethod
+    def _read(cachefn, filename):
+        magic = ParserDiskCache.MAGIC
+        try:
+            with open(cachefn, 'rb') as fd:
+                data = fd.read()
+            if data[:len(magic)] != magic:
+                raise ValueError('invalid magic')
+            sourcecode, directives, objects = marshal.loads(data[len(magic):])
+            parser = Parser.__new__(Parser)
+            parser.rules = []
+            parser.templates = []
+            parser.root = None
+            parser.dynamic_classes = {}
+            parser.filename = filename
+            parser.sourcecode = sourcecode
+            parser.directives = directives
+        except Exception as e:
+            Logger.warning('Builder: Invalid disk cache entry for <%s>: %s' %
+                           (filename, e))
+            try:
+                remove(cachefn)
+            except OSError:
+                pass
+            return
+        parser.execute_directives()
+        for x in objects:
+            ParserDiskCache._load_rule(parser, x)
+        return parser
+
+    @staticmethod
+    def _write(cachefn, parser):
+        # the top-level rules, in their order of creation
+        objects = []
+        seen = set()
+        for rule in parser.rules:
+            if id(rule[1]) not in seen:
+                seen.add(id(rule[1]))
+                objects.append(rule[1])
+        for template in parser.templates:
+            objects.append(template[2])
+        if parser.root is not None:
+            objects.append(parser.root)
+        objects.sort(key=lambda rule: rule.line)
+        try:
+            data = marshal.dumps((
+                parser.sourcecode, parser.directives,
+                [ParserDiskCache._dump_rule(x) for x in objects]))
+        except ValueError:
+            # a value evaluated by the parser can't be stored
+            return
+
+        # write in a temporary file first, in case another application is
+        # reading the same entry.
+        tmpfn = None
+        try:
+            fd, tmpfn = mkstemp(dir=ParserDiskCache.directory)
+            with fdopen(fd, 'wb') as fp:
+                fp.write(ParserDiskCache.MAGIC)
+                fp.write(data)
+            rename(tmpfn, cachefn)
+        except (OSError, IOError) as e:
+            Logger.warning('Builder: Unable to write the disk cache entry '
+                           '<%s>: %s' % (cachefn, e))
+            if tmpfn is not None and exists(tmpfn):
+                remove(tmpfn)
+
+
 def get_proxy(widget):
     try:
         return widget.proxy_ref
@@ -1247,16 +1520,19 @@ def create_handler(iself, element, key, value, rule, idmap, delayed=False):
     if uid not in _handlers:
         _handlers[uid] = []
 
-    idmap = copy(idmap)
-    idmap.update(global_idmap)
-    idmap['self'] = iself.proxy_ref
+    proxy = iself.proxy_ref
+    try:
+        expression = rule.create_expression(proxy, idmap)
+    except Exception as e:
+        raise BuilderException(rule.ctx, rule.line,
+                '{}: {}'.format(e.__class__.__name__, e))
 
     def call_fn(*args):
         if __debug__:
             trace('Builder: call_fn %s, key=%s, value=%r, %r' % (
                 element, key, value, rule.value))
         rule.count += 1
-        e_value = eval(value, idmap)
+        e_value = expression()
         if __debug__:
             trace('Builder: call_fn => value=%r' % (e_value, ))
         setattr(element, key, e_value)
@@ -1270,7 +1546,13 @@ def create_handler(iself, element, key, value, rule, idmap, delayed=False):
     if rule.watched_keys is not None:
         for k in rule.watched_keys:
             try:
-                f = idmap[k[0]]
+                name = k[0]
+                if name == 'self':
+                    f = proxy
+                elif name in global_idmap:
+                    f = global_idmap[name]
+                else:
+                    f = idmap[name]
                 for x in k[1:-1]:
                     f = getattr(f, x)
                 if hasattr(f, 'bind'):
@@ -1283,12 +1565,114 @@ def create_handler(iself, element, key, value, rule, idmap, delayed=False):
                 continue
 
     try:
-        return eval(value, idmap)
+        return expression()
     except Exception as e:
         raise BuilderException(rule.ctx, rule.line,
                 '{}: {}'.format(e.__class__.__name__, e))
 
 
+class CompiledRule(object):
+    '''Rule compiled to Python by the :mod:`~kivy.tools.kvcompiler` tool, see
+    :meth:`BuilderBase.load_compiled`.
+
+    .. versionadded:: 1.8.0
+    '''
+
+    __slots__ = ('ctx', 'func', 'avoid_previous_rules')
+
+    def __init__(self, filename, func, avoid_previous_rules):
+        # like the ctx of a ParserRule, for unload_file()
+        self.ctx = QueryDict(filename=filename)
+        #: Function applying the rule, called with the builder and the widget
+        self.func = func
+        #: Indicate if any previous rules should be avoided.
+        self.avoid_previous_rules = avoid_previous_rules
+
+    def __repr__(self):
+        return '<CompiledRule %r>' % (self.func, )
+
+
+def compiled_context(filename):
+    # context of the exceptions raised by a compiled kv file, the source code
+    # is not available.
+    return QueryDict(filename=filename, sourcecode=[])
+
+
+def compiled_execute_directives(ctx, directives):
+    # run the directives of a compiled kv file
+    parser = Parser.__new__(Parser)
+    parser.filename = ctx.filename
+    parser.sourcecode = ctx.sourcecode
+    parser.directives = directives
+    parser.execute_directives()
+
+
+def compiled_create(ctx, line, name):
+    # create a child widget of a compiled rule
+    if Factory.is_template(name):
+        raise BuilderException(ctx, line, 'Templates are not supported in '
+                               'compiled rules (%s)' % name)
+    return Factory.get(name)(__no_builder=True)
+
+
+def compiled_instruction(ctx, line, name):
+    # create a canvas instruction of a compiled rule
+    global Instruction
+    if Instruction is None:
+        Instruction = Factory.get('Instruction')
+    instr = Factory.get(name)()
+    if not isinstance(instr, Instruction):
+        raise BuilderException(
+            ctx, line, 'You can add only graphics Instruction in canvas.')
+    return instr
+
+
+def compiled_create_missing(marked, widget, names):
+    # same as ParserRule.create_missing()
+    cls = widget.__class__
+    if cls in marked:
+        return
+    marked.append(cls)
+    for name in names:
+        if not hasattr(widget, name):
+            widget.create_property(name)
+
+
+def compiled_delayed(fn):
+    # same as the delayed handlers of create_handler()
+    def delayed_call_fn(*args):
+        _delayed_calls.append(fn)
+    return delayed_call_fn
+
+
+def compiled_bind(widget, fn, f, key):
+    # same as the binding of the watched keys in create_handler(): f is the
+    # value of key[0]
+    try:
+        for x in key[1:-1]:
+            f = getattr(f, x)
+        if hasattr(f, 'bind'):
+            f.bind(**{key[-1]: fn})
+            uid = widget.uid
+            if uid not in _handlers:
+                _handlers[uid] = []
+            # make sure _handlers doesn't keep widgets alive
+            _handlers[uid].append([get_proxy(f), key[-1], fn])
+    except (KeyError, AttributeError):
+        pass
+
+
+def compiled_bind_handler(widget, name, fn):
+    # same as the handlers binding of BuilderBase._apply_rule()
+    key = name
+    if not widget.is_event_type(key):
+        key = key[3:]
+    widget.bind(**{key: fn})
+    #hack for on_parent
+    if name == 'on_parent':
+        Factory.Widget.parent.dispatch(widget.__self__)
+
+
 class ParserSelector(object):
 
     def __init__(self, key):
@@ -1318,24 +1702,33 @@ class ParserSelectorName(ParserSelector):
 
     parents = {}
 
-    def get_bases(self, cls):
+    @staticmethod
+    def get_bases(cls):
         for base in cls.__bases__:
             if base.__name__ == 'object':
                 break
             yield base
             if base.__name__ == 'Widget':
                 break
-            for cbase in self.get_bases(base):
+            for cbase in ParserSelectorName.get_bases(base):
                 yield cbase
 
-    def match(self, widget):
+    @staticmethod
+    def get_names(cls):
+        # return the lowercase names of the class and its bases
         parents = ParserSelectorName.parents
-        cls = widget.__class__
         if not cls in parents:
             classes = [x.__name__.lower() for x in
-                       [cls] + list(self.get_bases(cls))]
+                       [cls] + list(ParserSelectorName.get_bases(cls))]
             parents[cls] = classes
-        return self.key in parents[cls]
+        return parents[cls]
+
+    def match(self, widget):
+        return self.key in ParserSelectorName.get_names(widget.__class__)
+
+
+_indexed_selectors = (ParserSelectorName, ParserSelectorClass,
+                      ParserSelectorId)
 
 
 class BuilderBase(object):
@@ -1344,16 +1737,38 @@ class BuilderBase(object):
 
     By default, :class:`Builder` is the global Kivy instance used in widgets,
     that you can use to load other kv file in addition to the default one.
-    '''
 
-    _cache_match = {}
+    .. versionchanged:: 1.8.0
+        The rules are indexed by the class name, id and class of their
+        selectors: matching a widget only looks at the rules it can match.
+        Loading or unloading a file only forgets the cached matches of the
+        widgets that its rules can match. :attr:`rules` is now read-only.
+    '''
 
     def __init__(self):
         super(BuilderBase, self).__init__()
         self.dynamic_classes = {}
         self.templates = {}
-        self.rules = []
+        self._rules = []
         self.rulectx = {}
+        # rules matched per (class, id, cls) of the widgets
+        self._match_cache = {}
+        # (seq, rule) entries per (selector class, key), seq being the order
+        # of the rule in self._rules
+        self._match_index = {}
+        # (seq, selector, rule) entries of the selectors not indexed
+        self._match_others = []
+        self._match_seq = 0
+
+    @property
+    def rules(self):
+        '''List of the `(selector, rule)` pairs loaded, in the loading order.
+
+        It must not be modified: the rules are also indexed for
+        :meth:`match`, and the index is only updated by the methods loading
+        and unloading the kv files.
+        '''
+        return self._rules
 
     def load_file(self, filename, **kwargs):
         '''Insert a file into the language builder.
@@ -1362,23 +1777,33 @@ class BuilderBase(object):
             `rulesonly`: bool, default to False
                 If True, the Builder will raise an exception if you have a root
                 widget inside the definition.
+
+        .. versionchanged:: 1.8.0
+            The file is read from the disk cache if it's activated, see
+            :ref:`kv-disk-cache`.
         '''
         if __debug__:
             trace('Builder: load file %s' % filename)
+        kwargs['filename'] = filename
+        if ParserDiskCache.directory is None:
+            return self.load_string(self._read_file(filename), **kwargs)
+        return self._load_parser(
+            partial(ParserDiskCache.load, filename, self._read_file),
+            **kwargs)
+
+    def _read_file(self, filename):
         with open(filename, 'r') as fd:
-            kwargs['filename'] = filename
             data = fd.read()
 
-            # remove bom ?
-            if PY2:
-                if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
-                    raise ValueError('Unsupported UTF16 for kv files.')
-                if data.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
-                    raise ValueError('Unsupported UTF32 for kv files.')
-                if data.startswith(codecs.BOM_UTF8):
-                    data = data[len(codecs.BOM_UTF8):]
-
-            return self.load_string(data, **kwargs)
+        # remove bom ?
+        if PY2:
+            if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                raise ValueError('Unsupported UTF16 for kv files.')
+            if data.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+                raise ValueError('Unsupported UTF32 for kv files.')
+            if data.startswith(codecs.BOM_UTF8):
+                data = data[len(codecs.BOM_UTF8):]
+        return data
 
     def unload_file(self, filename):
         '''Unload all rules associated to a previously imported file.
@@ -1392,8 +1817,7 @@ class BuilderBase(object):
             template invocation.
         '''
         # remove rules and templates
-        self.rules = [x for x in self.rules if x[1].ctx.filename != filename]
-        self._clear_matchcache()
+        self._remove_rules(filename)
         templates = {}
         for x, y in self.templates.items():
             if y[2] != filename:
@@ -1411,15 +1835,19 @@ class BuilderBase(object):
                 If True, the Builder will raise an exception if you have a root
                 widget inside the definition.
         '''
+        return self._load_parser(
+            lambda: Parser(content=string, filename=kwargs.get('filename')),
+            **kwargs)
+
+    def _load_parser(self, get_parser, **kwargs):
         kwargs.setdefault('rulesonly', False)
         self._current_filename = fn = kwargs.get('filename', None)
         try:
             # parse the string
-            parser = Parser(content=string, filename=fn)
+            parser = get_parser()
 
             # merge rules with our rules
-            self.rules.extend(parser.rules)
-            self._clear_matchcache()
+            self._add_rules(parser.rules)
 
             # add the template found by the parser into ours
             for name, cls, template in parser.templates:
@@ -1484,10 +1912,110 @@ class BuilderBase(object):
         if not rules:
             return
         for rule in rules:
-            self._apply_rule(widget, rule, rule)
+            if type(rule) is CompiledRule:
+                rule.func(self, widget)
+            else:
+                self._apply_rule(widget, rule, rule)
+
+    def load_compiled(self, filename, rules, dynamic_classes):
+        '''Insert the rules of a kv file compiled by the
+        :mod:`~kivy.tools.kvcompiler` tool. This is called by the compiled
+        module itself, you don't need to use it.
+
+        :Parameters:
+            `filename`: str
+                Filename of the kv file, to unload it with
+                :meth:`unload_file`.
+            `rules`: list
+                List of `(avoid_previous_rules, selectors, func)` where
+                `selectors` is a list of `(kind, key)`, kind being 'name',
+                'class' or 'id'.
+            `dynamic_classes`: dict
+                Dynamic classes declared by the rules, with their base
+                classes.
+
+        .. versionadded:: 1.8.0
+        '''
+        selector_classes = {'name': ParserSelectorName,
+                            'class': ParserSelectorClass,
+                            'id': ParserSelectorId}
+        compiled_rules = []
+        for avoid_previous_rules, selectors, func in rules:
+            rule = CompiledRule(filename, func, avoid_previous_rules)
+            for kind, key in selectors:
+                compiled_rules.append((selector_classes[kind](key), rule))
+        self._add_rules(compiled_rules)
+        for name, baseclasses in iteritems(dynamic_classes):
+            Factory.register(name, baseclasses=baseclasses, filename=filename)
 
     def _clear_matchcache(self):
-        BuilderBase._match_cache = {}
+        self._match_cache = {}
+
+    def _add_rules(self, rules):
+        # append the (selector, rule) pairs to the rules and the index
+        keys = set()
+        others = False
+        index = self._match_index
+        for selector, rule in rules:
+            self._match_seq += 1
+            if type(selector) in _indexed_selectors:
+                key = (type(selector), selector.key)
+                if key not in index:
+                    index[key] = []
+                index[key].append((self._match_seq, rule))
+                keys.add(key)
+            else:
+                self._match_others.append((self._match_seq, selector, rule))
+                others = True
+        self._rules.extend(rules)
+        self._forget_matches(keys, others)
+
+    def _remove_rules(self, filename):
+        # remove the rules of the file from the rules and the index
+        keys = set()
+        index = self._match_index
+        for key, items in list(index.items()):
+            kept = [x for x in items if x[1].ctx.filename != filename]
+            if len(kept) == len(items):
+                continue
+            keys.add(key)
+            if kept:
+                index[key] = kept
+            else:
+                del index[key]
+        others = self._match_others
+        self._match_others = [x for x in others
+                              if x[2].ctx.filename != filename]
+        self._rules = [x for x in self._rules
+                       if x[1].ctx.filename != filename]
+        self._forget_matches(keys, len(others) != len(self._match_others))
+
+    def _forget_matches(self, keys, others=False):
+        # forget the cached matches of the widgets that can match the keys
+        # of the index. The selectors not indexed can match any widget.
+        cache = self._match_cache
+        if others:
+            self._clear_matchcache()
+            return
+        if not cache or not keys:
+            return
+        match_keys = self._match_keys
+        for k in list(cache.keys()):
+            if not keys.isdisjoint(match_keys(*k)):
+                del cache[k]
+
+    @staticmethod
+    def _match_keys(cls, widget_id, widget_cls):
+        # return the keys of the index that a widget can match. A selector
+        # is tested once, even if a name is repeated in the bases (like
+        # `class Button(Button)`) or in the cls of the widget.
+        keys = [(ParserSelectorName, x)
+                for x in ParserSelectorName.get_names(cls)]
+        if widget_id:
+            keys.append((ParserSelectorId, widget_id.lower()))
+        keys += [(ParserSelectorClass, x) for x in widget_cls]
+        seen = set()
+        return [x for x in keys if not (x in seen or seen.add(x))]
 
     def _apply_rule(self, widget, rule, rootrule, template_ctx=None):
         # widget: the current instanciated widget
@@ -1653,16 +2181,28 @@ class BuilderBase(object):
     def match(self, widget):
         '''Return a list of :class:`ParserRule` matching the widget.
         '''
-        cache = BuilderBase._match_cache
+        cache = self._match_cache
         k = (widget.__class__, widget.id, tuple(widget.cls))
         if k in cache:
             return cache[k]
-        rules = []
-        for selector, rule in self.rules:
+
+        # collect the matching rules from the index, in the rules order
+        matched = []
+        index = self._match_index
+        for key in self._match_keys(*k):
+            items = index.get(key)
+            if items:
+                matched += items
+        for seq, selector, rule in self._match_others:
             if selector.match(widget):
-                if rule.avoid_previous_rules:
-                    del rules[:]
-                rules.append(rule)
+                matched.append((seq, rule))
+        matched.sort(key=itemgetter(0))
+
+        rules = []
+        for seq, rule in matched:
+            if rule.avoid_previous_rules:
+                del rules[:]
+            rules.append(rule)
         cache[k] = rules
         return rules
 
@@ -1671,14 +2211,50 @@ class BuilderBase(object):
         expressions related to the canvas.
 
         .. versionadded:: 1.7.0
+
+        .. versionchanged:: 1.8.0
+            The expressions are executed once per sync, in the order they were
+            triggered. See :meth:`get_sync_stats`.
         '''
-        l = set(_delayed_calls)
+        if not _delayed_calls:
+            return
+        # an expression is executed once, even if several of its keys
+        # changed, like the pos and size of a moving widget. The calls
+        # triggered by the expressions are done at the next sync.
+        calls = _delayed_calls[:]
         del _delayed_calls[:]
-        for func in l:
+        done = set()
+        done_add = done.add
+        for func in calls:
+            if func in done:
+                continue
+            done_add(func)
             try:
                 func(None, None)
             except ReferenceError:
                 continue
+        _delayed_stats['syncs'] += 1
+        _delayed_stats['calls'] += len(done)
+        _delayed_stats['coalesced'] += len(calls) - len(done)
+
+    def get_sync_stats(self, reset=False):
+        '''Return the statistics of the expressions executed by
+        :meth:`sync`, as a dict:
+
+        * `syncs`: number of syncs that executed expressions,
+        * `calls`: number of expressions executed,
+        * `coalesced`: number of triggers skipped because the expression was
+          already waiting for the next sync.
+
+        If `reset` is True, the statistics are reset after being read.
+
+        .. versionadded:: 1.8.0
+        '''
+        stats = dict(_delayed_stats)
+        if reset:
+            for key in _delayed_stats:
+                _delayed_stats[key] = 0
+        return stats
 
     def unbind_widget(self, uid):
         '''(internal) Unbind all the handlers created by the rules of the
@@ -1701,7 +2277,8 @@ class BuilderBase(object):
         global Instruction
         if Instruction is None:
             Instruction = Factory.get('Instruction')
-        idmap = copy(self.rulectx[rootrule]['ids'])
+        # the expressions get the values of the ids when they are created
+        idmap = self.rulectx[rootrule]['ids']
         for crule in rule.children:
             name = crule.name
             if name == 'Clear':
@@ -1724,8 +2301,22 @@ class BuilderBase(object):
                 raise BuilderException(prule.ctx, prule.line,
                         '{}: {}'.format(e.__class__.__name__, e))
 
+
+def _trim_match_cache(level):
+    # the rules matching the widgets are computed again when needed, a share
+    # of the matches is forgotten. See Cache.trim().
+    cache = Builder._match_cache
+    freed = 0
+    for key in list(cache)[:int(len(cache) * level + .5)]:
+        freed += sys.getsizeof(cache.pop(key))
+    return freed
+
+Cache.add_trim_callback(_trim_match_cache)
+
 #: Main instance of a :class:`BuilderBase`.
 Builder = register_context('Builder', BuilderBase)
+if Config is not None and Config.getint('kivy', 'kv_disk_cache'):
+    ParserDiskCache.enable()
 Builder.load_file(join(kivy_data_dir, 'style.kv'), rulesonly=True)
 
 if 'KIVY_PROFILE_LANG' in environ:
@@ -1733,7 +2324,7 @@ if 'KIVY_PROFILE_LANG' in environ:
     import cgi
 
     def match_rule(fn, index, rule):
-        if rule.ctx.filename != fn:
+        if rule.ctx.filename != fn or type(rule) is CompiledRule:
             return
         for prop, prp in iteritems(rule.properties):
             if prp.line != index:
@@ -1780,6 +2371,9 @@ if 'KIVY_PROFILE_LANG' in environ:
                         '<td><pre>', line, '</pre></td>',
                         '</tr>']
             html += ['</table>']
+        stats = Builder.get_sync_stats()
+        html += ['<p>Canvas expressions: {calls} executed in {syncs} syncs, '
+                 '{coalesced} coalesced</p>'.format(**stats)]
         html += ['</body></html>']
         with open('builder_stats.html', 'w') as fd:
             fd.write(''.join(html))
@@ -17,6 +17,8 @@ loading of modules is managed by the config file. Currently, we include:
       widget properties.
     * :class:`~kivy.modules.webdebugger`: Realtime examination of your app
       internals via a web browser.
+    * :class:`~kivy.modules.bindings`: Report the observers bound to the
+      properties and events, and the bindings leaking widgets.
 
 Modules are automatically loaded from the Kivy path and User path:
 
@@ -54,6 +54,8 @@ def getfile(name):
 
 class FlaskThread(threading.Thread):
 
+    last_stats = {}
+
     def run(self):
         Clock.schedule_interval(self.dump_metrics, .1)
         app.run(debug=True, use_debugger=True, use_reloader=False)
@@ -65,9 +67,19 @@ class FlaskThread(threading.Thread):
         m['FPS (internal)'].append(Clock.get_fps())
         m['FPS (real)'].append(Clock.get_rfps())
         m['Events'].append(sum([len(x) for x in Clock._events.values()]))
-        for category in Cache._categories:
-            m['Cache ' + category].append(
-                len(Cache._objects.get(category, [])))
+        stats = Cache.get_stats()
+        last_stats = self.last_stats
+        for category, s in stats.items():
+            m['Cache ' + category].append(s['objects'])
+            # hit rate since the last dump
+            last = last_stats.get(category)
+            if last is not None:
+                hits = s['hits'] - last['hits']
+                requests = hits + s['misses'] - last['misses']
+                m['Cache %s hit rate (%%)' % category].append(
+                    hits * 100. / requests if requests else 0)
+        self.last_stats = stats
+        m['Cache memory (KB)'].append(Cache.get_bytes() / 1024.)
         for values in m.values():
             values.pop(0)
             values[0] = 0
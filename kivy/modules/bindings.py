@@ -0,0 +1,220 @@
+'''
+Bindings module
+===============
+
+.. versionadded:: 1.8.0
+
+The Bindings module reports the observers bound to the properties and events
+of all the live :class:`~kivy.event.EventDispatcher` instances, to find the
+bindings that slow down your application or keep objects alive:
+
+* number of observers per class and property,
+* properties with a dispatch fan-out above a threshold,
+* observers of dead objects, that will never be called again,
+* observers of widgets detached from the window and from the widget tree of
+  the object they observe, usually a binding that has not been removed and
+  keeps the widget alive.
+
+Usage
+-----
+
+For normal module usage, please see the :mod:`~kivy.modules` documentation.
+The report is written to the log when the application stops, and to a JSON
+file if `filename` is set.
+
+The report can also be built from your code, with :func:`collect`, and
+written with :func:`dump`::
+
+    from kivy.modules import bindings
+    report = bindings.collect(fanout=20)
+    bindings.dump(report, 'bindings.json')
+
+Configuration
+-------------
+
+:Parameters:
+    `fanout`: int, defaults to 50
+        Report the properties and events having more observers than that.
+    `interval`: float, defaults to 0
+        If set, also log a report every `interval` seconds.
+    `filename`: str, defaults to ''
+        If set, write the last report in this file, as JSON.
+
+Example
+-------
+
+In your configuration (`~/.kivy/config.ini`), you can add something like
+this::
+
+    [modules]
+    bindings = fanout=20,filename=bindings.json
+
+'''
+
+__all__ = ('collect', 'dump', 'log')
+
+import gc
+import json
+from weakref import ProxyType, CallableProxyType
+from functools import partial
+from kivy.base import EventLoop
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.logger import Logger
+from kivy.properties import Property, WeakObserver
+from kivy.weakmethod import WeakMethod
+
+
+_proxy_types = (ProxyType, CallableProxyType)
+
+
+def _describe(observer):
+    # return a readable name for the observer, and the object it is bound to
+    if isinstance(observer, (WeakMethod, WeakObserver)):
+        if observer.is_dead():
+            return repr(observer), None
+        if isinstance(observer, WeakObserver):
+            observer = observer.callback
+        else:
+            observer = observer()
+    if isinstance(observer, partial):
+        observer = observer.func
+    target = getattr(observer, '__self__', None)
+    name = getattr(observer, '__name__', None) or repr(observer)
+    if isinstance(target, Property):
+        return 'property %s' % target.name, None
+    if target is not None:
+        name = '%s.%s' % (target.__class__.__name__, name)
+        uid = getattr(target, 'uid', None)
+        if uid is not None:
+            name = '%s (uid %d)' % (name, uid)
+    return name, target
+
+
+def _is_dead(observer):
+    is_dead = getattr(observer, 'is_dead', None)
+    return is_dead is not None and is_dead()
+
+
+def _root(obj):
+    # return the root of the widget tree of the object
+    seen = set()
+    while True:
+        parent = getattr(obj, 'parent', None)
+        if parent is None or id(obj) in seen:
+            return obj
+        seen.add(id(obj))
+        obj = parent
+
+
+def collect(fanout=50):
+    '''Return a report of the observers of all the live
+    :class:`~kivy.event.EventDispatcher` instances, as a dict:
+
+    * `instances`: the number of instances found,
+    * `classes`: for each class name, the number of `instances` and the
+      total number of `observers` for each property and event,
+    * `fanout`: the properties and events having more than `fanout`
+      observers, sorted by number of observers,
+    * `dead`: the observers of dead objects,
+    * `detached`: the observers of widgets that are neither in the widget
+      tree of the object they observe nor in the window.
+
+    The entries of `fanout`, `dead` and `detached` give the `class` and `uid`
+    of the instance, the `name` of the property or event and either the
+    number of `observers` or the `observer` itself.
+    '''
+    classes = {}
+    fanouts = []
+    dead = []
+    detached = []
+    count = 0
+    for obj in gc.get_objects():
+        # the weak proxies of dead objects raise on any access
+        if type(obj) in _proxy_types or not isinstance(obj, EventDispatcher):
+            continue
+        count += 1
+        clsname = obj.__class__.__name__
+        stats = classes.get(clsname)
+        if stats is None:
+            stats = classes[clsname] = {'instances': 0, 'observers': {}}
+        stats['instances'] += 1
+        observers = stats['observers']
+        root = None
+
+        names = list(obj.properties().keys()) + list(obj.events())
+        for name in names:
+            items = obj.get_property_observers(name)
+            if not items:
+                continue
+            observers[name] = observers.get(name, 0) + len(items)
+            if len(items) > fanout:
+                fanouts.append({'class': clsname, 'uid': obj.uid,
+                                'name': name, 'observers': len(items)})
+            for observer in items:
+                description, target = _describe(observer)
+                entry = {'class': clsname, 'uid': obj.uid, 'name': name,
+                         'observer': description}
+                if _is_dead(observer):
+                    dead.append(entry)
+                    continue
+                if target is None or target is obj or \
+                        not hasattr(target, 'parent'):
+                    continue
+                if root is None:
+                    root = _root(obj)
+                target_root = _root(target)
+                if target_root is not root and \
+                        target_root is not EventLoop.window:
+                    detached.append(entry)
+
+    fanouts.sort(key=lambda entry: entry['observers'], reverse=True)
+    return {'instances': count, 'classes': classes, 'fanout': fanouts,
+            'dead': dead, 'detached': detached}
+
+
+def dump(report, filename):
+    '''Write a report returned by :func:`collect` in `filename`, as JSON.
+    '''
+    with open(filename, 'w') as fd:
+        json.dump(report, fd, indent=2, sort_keys=True)
+
+
+def log(report):
+    '''Write a summary of a report returned by :func:`collect` in the log.
+    '''
+    Logger.info('Bindings: %d instances, %d dead observers, '
+                '%d detached observers' % (
+                    report['instances'], len(report['dead']),
+                    len(report['detached'])))
+    for entry in report['fanout']:
+        Logger.info('Bindings: %(class)s.%(name)s (uid %(uid)d) has '
+                    '%(observers)d observers' % entry)
+    for entry in report['dead']:
+        Logger.warning('Bindings: %(class)s.%(name)s (uid %(uid)d) is '
+                       'bound to the dead %(observer)s' % entry)
+    for entry in report['detached']:
+        Logger.warning('Bindings: %(class)s.%(name)s (uid %(uid)d) is '
+                       'bound to the detached %(observer)s' % entry)
+
+
+def update(ctx, *largs):
+    ctx.report = collect(ctx.fanout)
+    log(ctx.report)
+
+
+def start(win, ctx):
+    ctx.fanout = int(ctx.config.get('fanout', 50))
+    ctx.interval = float(ctx.config.get('interval', 0))
+    ctx.filename = ctx.config.get('filename', '')
+    ctx.update = partial(update, ctx)
+    if ctx.interval:
+        Clock.schedule_interval(ctx.update, ctx.interval)
+
+
+def stop(win, ctx):
+    if ctx.interval:
+        Clock.unschedule(ctx.update)
+    update(ctx)
+    if ctx.filename:
+        dump(ctx.report, ctx.filename)
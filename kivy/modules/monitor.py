@@ -7,17 +7,42 @@ application :
 
 * FPS
 * Graph of input events
+* Most expensive Clock callbacks, if profiling is activated
+* Cache statistics, if activated
 
 Usage
 -----
 
 For normal module usage, please see the :mod:`~kivy.modules` documentation.
 
+Configuration
+-------------
+
+:Parameters:
+    `profile`: int, defaults to 0
+        If set, activate the profiling of the
+        :class:`~kivy.clock.Clock` callbacks and show the `profile` most
+        expensive ones under the toolbar. See :ref:`clock-profiling`.
+    `cache`: int, defaults to 0
+        If set, show the statistics of each :class:`~kivy.cache.Cache`
+        category at the bottom of the window: number of objects, memory
+        used, hit rate, evictions and timeouts.
+
+Example
+-------
+
+In your configuration (`~/.kivy/config.ini`), you can add something like
+this::
+
+    [modules]
+    monitor = profile=5,cache=1
+
 '''
 
 from kivy.uix.label import Label
 from kivy.graphics import Rectangle, Color
 from kivy.clock import Clock
+from kivy.cache import Cache
 from kivy.input.postproc import kivy_postproc_modules
 from functools import partial
 
@@ -31,6 +56,45 @@ def update_fps(ctx, *largs):
     ctx.rectangle.size = ctx.label.texture_size
 
 
+def update_profile(ctx, *largs):
+    lines = ['%-40s %6d calls %9.2fms total %7.2fms max' % (
+        name[-40:], calls, total * 1000., maximum * 1000.)
+        for name, calls, total, maximum in Clock.get_profile(ctx.profile)]
+    label = ctx.profile_label
+    label.text = '\n'.join(lines) or 'No callback profiled yet'
+    label.texture_update()
+    win = ctx.win
+    w, h = label.texture_size
+    ctx.profile_rectangle.texture = label.texture
+    ctx.profile_rectangle.size = w, h
+    ctx.profile_rectangle.pos = 5, win.height - 30 - h
+    ctx.profile_background.size = win.width, h + 10
+    ctx.profile_background.pos = 0, win.height - 35 - h
+
+
+def update_cache(ctx, *largs):
+    lines = []
+    stats = Cache.get_stats()
+    for category in sorted(stats):
+        s = stats[category]
+        requests = s['hits'] + s['misses']
+        hitrate = s['hits'] * 100. / requests if requests else 0.
+        lines.append('%-20s %6d objs %9.1fKB %5.1f%% hits %6d evicted '
+                     '%6d timeouts' % (
+                         category[-20:], s['objects'], s['bytes'] / 1024.,
+                         hitrate, s['evictions'], s['timeouts']))
+    lines.append('%-20s %21.1fKB' % ('total', Cache.get_bytes() / 1024.))
+    label = ctx.cache_label
+    label.text = '\n'.join(lines)
+    label.texture_update()
+    w, h = label.texture_size
+    ctx.cache_rectangle.texture = label.texture
+    ctx.cache_rectangle.size = w, h
+    ctx.cache_rectangle.pos = 5, 5
+    ctx.cache_background.size = ctx.win.width, h + 10
+    ctx.cache_background.pos = 0, 0
+
+
 def update_stats(ctx, *largs):
     global _statsinput
     ctx.stats = ctx.stats[1:] + [_statsinput]
@@ -74,6 +138,33 @@ def start(win, ctx):
     Clock.schedule_interval(partial(update_fps, ctx), .5)
     Clock.schedule_interval(partial(update_stats, ctx), 1 / 60.)
 
+    ctx.profile = int(ctx.config.get('profile', 0))
+    if ctx.profile:
+        ctx.win = win
+        ctx.profile_label = Label(font_size=11,
+                                  font_name='data/fonts/DroidSansMono.ttf')
+        with win.canvas.after:
+            Color(0, 0, 0, .7)
+            ctx.profile_background = Rectangle()
+            Color(1, 1, 1)
+            ctx.profile_rectangle = Rectangle()
+        Clock.enable_profiling()
+        Clock.schedule_interval(partial(update_profile, ctx), .5)
+
+    ctx.cache = int(ctx.config.get('cache', 0))
+    if ctx.cache:
+        ctx.win = win
+        ctx.cache_label = Label(font_size=11,
+                                font_name='data/fonts/DroidSansMono.ttf')
+        with win.canvas.after:
+            Color(0, 0, 0, .7)
+            ctx.cache_background = Rectangle()
+            Color(1, 1, 1)
+            ctx.cache_rectangle = Rectangle()
+        Clock.schedule_interval(partial(update_cache, ctx), .5)
+
 
 def stop(win, ctx):
     win.canvas.remove(ctx.label)
+    if ctx.profile:
+        Clock.disable_profiling()
@@ -16,6 +16,7 @@ cdef class PropertyStorage:
     cdef object getter
     cdef object setter
     cdef int alias_initial
+    cdef int deferred
 
 cdef class Property:
     cdef str _name
@@ -27,7 +28,10 @@ cdef class Property:
     cdef init_storage(self, EventDispatcher obj, PropertyStorage storage)
     cpdef link(self, EventDispatcher obj, str name)
     cpdef link_deps(self, EventDispatcher obj, str name)
+    cdef PropertyStorage get_storage(self, EventDispatcher obj)
     cpdef bind(self, EventDispatcher obj, observer)
+    cpdef bind_weak(self, EventDispatcher obj, observer)
+    cdef remove_observer(self, EventDispatcher obj, observer)
     cpdef unbind(self, EventDispatcher obj, observer)
     cdef compare_value(self, a, b)
     cpdef set(self, EventDispatcher obj, value)
@@ -35,6 +39,7 @@ cdef class Property:
     cdef check(self, EventDispatcher obj, x)
     cdef convert(self, EventDispatcher obj, x)
     cpdef dispatch(self, EventDispatcher obj)
+    cdef dispatch_deferred(self, EventDispatcher obj)
 
 cdef class NumericProperty(Property):
     cdef float parse_str(self, EventDispatcher obj, value)
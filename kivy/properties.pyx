@@ -175,6 +175,7 @@ include "graphics/config.pxi"
 
 from weakref import ref
 from kivy.compat import string_types
+from kivy.weakmethod import WeakMethod
 
 cdef float g_dpi = -1
 cdef float g_density = -1
@@ -206,6 +207,58 @@ cpdef float dpi2px(value, ext):
     elif ext == 'mm':
         return rv * g_dpi / 25.4
 
+cdef inline int is_dependency(observer):
+    # observers used by the properties depending on other properties, like
+    # ReferenceListProperty or AliasProperty
+    return isinstance(getattr(observer, '__self__', None), Property)
+
+
+cdef class WeakObserver:
+    '''Observer holding a weak reference to a callback, see
+    :meth:`Property.bind_weak`. It compares equal to its callback, so the
+    callback can be unbound as usual.
+
+    .. versionadded:: 1.8.0
+    '''
+    cdef object method
+    cdef Property prop
+
+    def __cinit__(self, Property prop, callback):
+        self.prop = prop
+        self.method = WeakMethod(callback)
+
+    def __call__(self, EventDispatcher obj, value):
+        callback = self.method()
+        if callback is None:
+            # the object of the callback has gone, forget it
+            self.prop.remove_observer(obj, self)
+            return
+        return callback(obj, value)
+
+    def __richcmp__(WeakObserver self, other, int op):
+        if op != 2 and op != 3:
+            return NotImplemented
+        if isinstance(other, WeakObserver):
+            equal = other is self
+        else:
+            equal = self.method() == other
+        return equal if op == 2 else not equal
+
+    property callback:
+        '''The callback, or None if its object has been collected.
+        '''
+        def __get__(self):
+            return self.method()
+
+    def is_dead(self):
+        '''Return True if the object of the callback has been collected.
+        '''
+        return self.method.is_dead()
+
+    def __repr__(self):
+        return '<WeakObserver %r>' % self.method()
+
+
 cdef class Property:
     '''Base class for building more complex properties.
 
@@ -296,6 +349,10 @@ cdef class Property:
         property instance doesn't know its name. That's why :func:`link` is
         used in Widget.__new__. The link function is also used to create the
         storage space of the property for this specific widget instance.
+
+        .. versionchanged:: 1.8.0
+            The storage is created on the first access to the property of an
+            instance, not when the instance is created.
         '''
         cdef PropertyStorage d = PropertyStorage()
         self._name = name
@@ -305,17 +362,56 @@ cdef class Property:
     cpdef link_deps(self, EventDispatcher obj, str name):
         pass
 
+    cdef PropertyStorage get_storage(self, EventDispatcher obj):
+        # the storage is created on the first access to the property
+        cdef PropertyStorage ps = obj.__storage.get(self._name)
+        if ps is None:
+            self.link(obj, self._name)
+            self.link_deps(obj, self._name)
+            ps = obj.__storage[self._name]
+        return ps
+
     cpdef bind(self, EventDispatcher obj, observer):
         '''Add a new observer to be called only when the value is changed.
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
+        cdef list observers = ps.observers
+        cdef int index
+        if observer in observers:
+            return
+        if is_dependency(observer):
+            # the storages are created lazily, so a dependent property may be
+            # bound after the other observers: keep it called before them,
+            # for them to see its updated value. The list is replaced, as it
+            # may be iterated by a dispatch in progress.
+            index = 0
+            while index < len(observers) and is_dependency(observers[index]):
+                index += 1
+            ps.observers = observers[:index] + [observer] + observers[index:]
+        else:
+            observers.append(observer)
+
+    cpdef bind_weak(self, EventDispatcher obj, observer):
+        '''Same as :meth:`bind`, but only keep a weak reference to the
+        observer if it is a bound method: the observer doesn't keep its object
+        alive, and is removed once the object is gone.
+
+        .. versionadded:: 1.8.0
+        '''
+        cdef PropertyStorage ps = self.get_storage(obj)
         if observer not in ps.observers:
-            ps.observers.append(observer)
+            ps.observers.append(WeakObserver(self, observer))
+
+    cdef remove_observer(self, EventDispatcher obj, observer):
+        # the list is replaced, not modified, as it may be iterated by a
+        # dispatch in progress
+        cdef PropertyStorage ps = self.get_storage(obj)
+        ps.observers = [x for x in ps.observers if x is not observer]
 
     cpdef unbind(self, EventDispatcher obj, observer):
         '''Remove the observer from our widget observer list.
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         for item in ps.observers[:]:
             if item == observer:
                 ps.observers.remove(item)
@@ -334,7 +430,7 @@ cdef class Property:
     cpdef set(self, EventDispatcher obj, value):
         '''Set a new value for the property.
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         value = self.convert(obj, value)
         realvalue = ps.value
         if self.compare_value(realvalue, value):
@@ -359,7 +455,7 @@ cdef class Property:
     cpdef get(self, EventDispatcher obj):
         '''Return the value of the property.
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         return ps.value
 
     #
@@ -403,10 +499,32 @@ cdef class Property:
             prop.dispatch(button)
 
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
-        if len(ps.observers):
-            value = ps.value
-            for observer in ps.observers:
+        cdef PropertyStorage ps = self.get_storage(obj)
+        cdef list observers = ps.observers
+        cdef Py_ssize_t count = len(observers)
+        if count == 0:
+            return
+        value = ps.value
+        if obj._defer_dispatch(self, ps):
+            # the observers will be called at the end of the batch, only
+            # keep the properties depending on this one up to date.
+            for observer in observers:
+                if is_dependency(observer):
+                    observer(obj, value)
+            return
+        if count == 1:
+            observers[0](obj, value)
+            return
+        for observer in observers:
+            observer(obj, value)
+
+    cdef dispatch_deferred(self, EventDispatcher obj):
+        # called at the end of a batch, the dependent properties have already
+        # been updated during the batch.
+        cdef PropertyStorage ps = self.get_storage(obj)
+        value = ps.value
+        for observer in ps.observers:
+            if not is_dependency(observer):
                 observer(obj, value)
 
 
@@ -471,7 +589,7 @@ cdef class NumericProperty(Property):
         return self.parse_list(obj, value[:-2], <str>value[-2:])
 
     cdef float parse_list(self, EventDispatcher obj, value, str ext):
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         ps.numeric_fmt = ext
         return dpi2px(value, ext)
 
@@ -481,7 +599,7 @@ cdef class NumericProperty(Property):
         the value have not been changed at all). Otherwise, it can be one of
         'in', 'pt', 'cm', 'mm'.
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         return ps.numeric_fmt
 
 
@@ -502,11 +620,31 @@ cdef class StringProperty(Property):
                 obj.__class__.__name__,
                 self.name))
 
-cdef inline void observable_list_dispatch(object self):
+cdef inline void observable_list_dispatch(object self, tuple op):
     cdef Property prop = self.prop
     obj = self.obj()
     if obj is not None:
-        prop.dispatch(obj)
+        # the change is only described during its dispatch
+        self.last_op = op
+        try:
+            prop.dispatch(obj)
+        finally:
+            self.last_op = None
+
+
+cdef inline object observable_list_range(object self, object key):
+    # return the (start, stop) range of the items at key, or None for an
+    # extended slice
+    cdef Py_ssize_t index
+    if isinstance(key, slice):
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            return None
+        return start, max(start, stop)
+    index = key
+    if index < 0:
+        index += len(self)
+    return index, index + 1
 
 
 class ObservableList(list):
@@ -514,66 +652,118 @@ class ObservableList(list):
     def __init__(self, *largs):
         self.prop = largs[0]
         self.obj = ref(largs[1])
+        self.last_op = None
         super(ObservableList, self).__init__(*largs[2:])
 
     def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = list(value)
+        else:
+            list.__getitem__(self, key)
+        r = observable_list_range(self, key)
+        if r is None:
+            list.__setitem__(self, key, value)
+            observable_list_dispatch(self, ('__setitem__', None, None, None))
+            return
+        removed = list.__getitem__(self, slice(r[0], r[1]))
         list.__setitem__(self, key, value)
-        observable_list_dispatch(self)
+        if not isinstance(key, slice):
+            value = [value]
+        observable_list_dispatch(self, ('__setitem__', r[0], value, removed))
 
     def __delitem__(self, key):
+        if not isinstance(key, slice):
+            list.__getitem__(self, key)
+        r = observable_list_range(self, key)
+        if r is None:
+            list.__delitem__(self, key)
+            observable_list_dispatch(self, ('__delitem__', None, None, None))
+            return
+        removed = list.__getitem__(self, slice(r[0], r[1]))
         list.__delitem__(self, key)
-        observable_list_dispatch(self)
-
-    def __setslice__(self, *largs):
-        list.__setslice__(self, *largs)
-        observable_list_dispatch(self)
-
-    def __delslice__(self, *largs):
-        list.__delslice__(self, *largs)
-        observable_list_dispatch(self)
-
-    def __iadd__(self, *largs):
-        list.__iadd__(self, *largs)
-        observable_list_dispatch(self)
-
-    def __imul__(self, *largs):
-        list.__imul__(self, *largs)
-        observable_list_dispatch(self)
-
-    def append(self, *largs):
-        list.append(self, *largs)
-        observable_list_dispatch(self)
-
-    def remove(self, *largs):
-        list.remove(self, *largs)
-        observable_list_dispatch(self)
-
-    def insert(self, *largs):
-        list.insert(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, ('__delitem__', r[0], [], removed))
+
+    def __setslice__(self, start, stop, value):
+        # Python 2 only method
+        ObservableList.__setitem__(self, slice(start, stop), value)
+
+    def __delslice__(self, start, stop):
+        # Python 2 only method
+        ObservableList.__delitem__(self, slice(start, stop))
+
+    def __iadd__(self, value):
+        cdef Py_ssize_t start = len(self)
+        value = list(value)
+        list.__iadd__(self, value)
+        observable_list_dispatch(self, ('__iadd__', start, value, []))
+        return self
+
+    def __imul__(self, value):
+        list.__imul__(self, value)
+        observable_list_dispatch(self, ('__imul__', None, None, None))
+        return self
+
+    def append(self, value):
+        list.append(self, value)
+        observable_list_dispatch(self, ('append', len(self) - 1, [value], []))
+
+    def remove(self, value):
+        cdef Py_ssize_t index = list.index(self, value)
+        removed = list.pop(self, index)
+        observable_list_dispatch(self, ('remove', index, [], [removed]))
+
+    def insert(self, index, value):
+        cdef Py_ssize_t length = len(self)
+        cdef Py_ssize_t i = index
+        list.insert(self, i, value)
+        if i < 0:
+            i = max(0, i + length)
+        i = min(i, length)
+        observable_list_dispatch(self, ('insert', i, [value], []))
 
     def pop(self, *largs):
+        cdef Py_ssize_t index = largs[0] if largs else -1
         cdef object result = list.pop(self, *largs)
-        observable_list_dispatch(self)
+        if index < 0:
+            index += len(self) + 1
+        observable_list_dispatch(self, ('pop', index, [], [result]))
         return result
 
-    def extend(self, *largs):
-        list.extend(self, *largs)
-        observable_list_dispatch(self)
+    def extend(self, value):
+        cdef Py_ssize_t start = len(self)
+        value = list(value)
+        list.extend(self, value)
+        observable_list_dispatch(self, ('extend', start, value, []))
 
-    def sort(self, *largs):
-        list.sort(self, *largs)
-        observable_list_dispatch(self)
+    def sort(self, *largs, **kwargs):
+        list.sort(self, *largs, **kwargs)
+        observable_list_dispatch(self, ('sort', None, None, None))
 
     def reverse(self, *largs):
         list.reverse(self, *largs)
-        observable_list_dispatch(self)
+        observable_list_dispatch(self, ('reverse', None, None, None))
 
 
 cdef class ListProperty(Property):
     '''Property that represents a list.
 
     Only lists are allowed. Tuple or any other classes are forbidden.
+
+    .. versionchanged:: 1.8.0
+        During the dispatch of a change made inside the list, the `last_op`
+        attribute of the list describes the change as a tuple
+        `(op, index, added, removed)`: `op` is the name of the list method
+        called, and the `removed` items starting at `index` have been
+        replaced by the `added` items. For `sort`, `reverse`, `__imul__` and
+        the extended slices, only `op` is set, and everything may have
+        changed. `last_op` is None when the whole list has been replaced::
+
+            def on_items(self, instance, value):
+                op = value.last_op
+                if op is not None and op[1] is not None:
+                    op, index, added, removed = op
+                    # update only the items changed
+                    ...
     '''
     def __init__(self, defaultvalue=None, **kw):
         defaultvalue = defaultvalue or []
@@ -582,7 +772,7 @@ cdef class ListProperty(Property):
 
     cpdef link(self, EventDispatcher obj, str name):
         Property.link(self, obj, name)
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         ps.value = ObservableList(self, obj, ps.value)
 
     cdef check(self, EventDispatcher obj, value):
@@ -597,9 +787,14 @@ cdef class ListProperty(Property):
         value = ObservableList(self, obj, value)
         Property.set(self, obj, value)
 
-cdef inline void observable_dict_dispatch(object self):
+cdef inline void observable_dict_dispatch(object self, tuple op):
     cdef Property prop = self.prop
-    prop.dispatch(self.obj)
+    # the change is only described during its dispatch
+    dict.__setattr__(self, 'last_op', op)
+    try:
+        prop.dispatch(self.obj)
+    finally:
+        dict.__setattr__(self, 'last_op', None)
 
 
 class ObservableDict(dict):
@@ -607,6 +802,7 @@ class ObservableDict(dict):
     def __init__(self, *largs):
         self.prop = largs[0]
         self.obj = largs[1]
+        self.last_op = None
         super(ObservableDict, self).__init__(*largs[2:])
 
     def _weak_return(self, item):
@@ -625,50 +821,59 @@ class ObservableDict(dict):
                 raise KeyError(attr)
 
     def __setattr__(self, attr, value):
-        if attr in ('prop', 'obj'):
+        if attr in ('prop', 'obj', 'last_op'):
             super(ObservableDict, self).__setattr__(attr, value)
             return
         self.__setitem__(attr, value)
 
     def __setitem__(self, key, value):
         dict.__setitem__(self, key, value)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, ('__setitem__', (key, )))
 
     def __delitem__(self, key):
         dict.__delitem__(self, key)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, ('__delitem__', (key, )))
 
     def clear(self, *largs):
         dict.clear(self, *largs)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, ('clear', None))
 
     def remove(self, *largs):
         dict.remove(self, *largs)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, ('remove', None))
 
-    def pop(self, *largs):
-        cdef object result = dict.pop(self, *largs)
-        observable_dict_dispatch(self)
+    def pop(self, key, *largs):
+        cdef object result = dict.pop(self, key, *largs)
+        observable_dict_dispatch(self, ('pop', (key, )))
         return result
 
     def popitem(self, *largs):
         cdef object result = dict.popitem(self, *largs)
-        observable_dict_dispatch(self)
+        observable_dict_dispatch(self, ('popitem', (result[0], )))
         return result
 
-    def setdefault(self, *largs):
-        dict.setdefault(self, *largs)
-        observable_dict_dispatch(self)
+    def setdefault(self, key, *largs):
+        cdef object result = dict.setdefault(self, key, *largs)
+        observable_dict_dispatch(self, ('setdefault', (key, )))
+        return result
 
-    def update(self, *largs):
-        dict.update(self, *largs)
-        observable_dict_dispatch(self)
+    def update(self, *largs, **kwargs):
+        cdef dict items = dict(*largs, **kwargs)
+        dict.update(self, items)
+        observable_dict_dispatch(self, ('update', tuple(items)))
 
 
 cdef class DictProperty(Property):
     '''Property that represents a dict.
 
     Only dict are allowed. Any other classes are forbidden.
+
+    .. versionchanged:: 1.8.0
+        During the dispatch of a change made inside the dict, the `last_op`
+        attribute of the dict describes the change as a tuple `(op, keys)`:
+        `op` is the name of the dict method called, and `keys` the tuple of
+        the keys changed, or None if all the keys may have changed (`clear`).
+        `last_op` is None when the whole dict has been replaced.
     '''
     def __init__(self, defaultvalue=None, **kw):
         defaultvalue = defaultvalue or {}
@@ -677,7 +882,7 @@ cdef class DictProperty(Property):
 
     cpdef link(self, EventDispatcher obj, str name):
         Property.link(self, obj, name)
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         ps.value = ObservableDict(self, obj, ps.value)
 
     cdef check(self, EventDispatcher obj, value):
@@ -805,7 +1010,7 @@ cdef class BoundedNumericProperty(Property):
 
         .. versionadded:: 1.1.0
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if value is None:
             ps.bnum_use_min = 0
         elif type(value) is float:
@@ -828,7 +1033,7 @@ cdef class BoundedNumericProperty(Property):
 
         .. versionadded:: 1.1.0
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if ps.bnum_use_min == 1:
             return ps.bnum_min
         elif ps.bnum_use_min == 2:
@@ -845,7 +1050,7 @@ cdef class BoundedNumericProperty(Property):
 
         .. versionadded:: 1.1.0
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if value is None:
             ps.bnum_use_max = 0
         elif type(value) is float:
@@ -862,7 +1067,7 @@ cdef class BoundedNumericProperty(Property):
 
         .. versionadded:: 1.1.0
         '''
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if ps.bnum_use_max == 1:
             return ps.bnum_max
         if ps.bnum_use_max == 2:
@@ -871,7 +1076,7 @@ cdef class BoundedNumericProperty(Property):
     cdef check(self, EventDispatcher obj, value):
         if Property.check(self, obj, value):
             return True
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if ps.bnum_use_min == 1:
             _min = ps.bnum_min
             if value < _min:
@@ -947,7 +1152,7 @@ cdef class OptionProperty(Property):
     cdef check(self, EventDispatcher obj, value):
         if Property.check(self, obj, value):
             return True
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if value not in ps.options:
             raise ValueError('%s.%s is set to an invalid option %r. '
                              'Must be one of: %s' % (
@@ -999,7 +1204,7 @@ cdef class ReferenceListProperty(Property):
 
     cpdef link(self, EventDispatcher obj, str name):
         Property.link(self, obj, name)
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         ps.value = ObservableReferenceList(self, obj, ps.value)
 
     cpdef link_deps(self, EventDispatcher obj, str name):
@@ -1009,7 +1214,7 @@ cdef class ReferenceListProperty(Property):
             prop.bind(obj, self.trigger_change)
 
     cpdef trigger_change(self, EventDispatcher obj, value):
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if ps.stop_event:
             return
         p = ps.properties
@@ -1033,7 +1238,7 @@ cdef class ReferenceListProperty(Property):
         return list(value)
 
     cdef check(self, EventDispatcher obj, value):
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if len(value) != len(ps.properties):
             raise ValueError('%s.%s value length is immutable' % (
                 obj.__class__.__name__,
@@ -1042,7 +1247,7 @@ cdef class ReferenceListProperty(Property):
     cpdef set(self, EventDispatcher obj, _value):
         cdef int idx
         cdef list value
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         value = self.convert(obj, _value)
         if self.compare_value(ps.value, value):
             return False
@@ -1065,7 +1270,7 @@ cdef class ReferenceListProperty(Property):
         return True
 
     cpdef setitem(self, EventDispatcher obj, key, value):
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
 
         ps.stop_event = 1
         if isinstance(key, slice):
@@ -1081,7 +1286,7 @@ cdef class ReferenceListProperty(Property):
         self.dispatch(obj)
 
     cpdef get(self, EventDispatcher obj):
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         cdef tuple p = ps.properties
         try:
             ps.value.__setslice__(0, len(p),
@@ -1148,7 +1353,7 @@ cdef class AliasProperty(Property):
             oprop.bind(obj, self.trigger_change)
 
     cpdef trigger_change(self, EventDispatcher obj, value):
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         ps.alias_initial = 1
         dvalue = self.get(obj)
         if ps.value != dvalue:
@@ -1159,7 +1364,7 @@ cdef class AliasProperty(Property):
         return True
 
     cpdef get(self, EventDispatcher obj):
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if self.use_cache:
             if ps.alias_initial:
                 ps.value = ps.getter(obj)
@@ -1168,7 +1373,7 @@ cdef class AliasProperty(Property):
         return ps.getter(obj)
 
     cpdef set(self, EventDispatcher obj, value):
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         if ps.setter(obj, value):
             ps.value = self.get(obj)
             self.dispatch(obj)
@@ -1207,7 +1412,7 @@ cdef class VariableListProperty(Property):
 
     cpdef link(self, EventDispatcher obj, str name):
         Property.link(self, obj, name)
-        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef PropertyStorage ps = self.get_storage(obj)
         ps.value = ObservableList(self, obj, ps.value)
 
     cdef check(self, EventDispatcher obj, value):
@@ -6,7 +6,7 @@ Activate other framework/toolkit inside our event loop
 '''
 
 __all__ = ('install_gobject_iteration', 'install_twisted_reactor',
-    'install_android')
+    'install_android', 'install_asyncio_loop')
 
 from kivy.compat import PY2
 
@@ -206,3 +206,125 @@ def install_twisted_reactor(**kwargs):
     EventLoop.bind(on_start=reactor_start)
     EventLoop.bind(on_stop=reactor_stop)
 
+
+
+def install_asyncio_loop(loop=None):
+    '''Run the Kivy main loop from an asyncio event loop, so that the
+    coroutines and the Kivy callbacks share the main thread. Must be called
+    before the application is started::
+
+        from kivy.support import install_asyncio_loop
+        loop = install_asyncio_loop()
+
+        class MyApp(App):
+            def on_start(self):
+                loop.create_task(my_client_coroutine())
+
+        MyApp().run()
+
+    Instead of sleeping in the :class:`~kivy.clock.Clock`, each frame is
+    scheduled on the asyncio loop, which waits for the I/O until the next
+    frame is due (`maxfps`, or the next event with the idle mode). When an
+    asyncio callback schedules something in the Clock, the frame is moved up
+    so the Kivy work isn't delayed until the end of the idle sleep.
+
+    :Parameters:
+        `loop`: asyncio event loop, defaults to None
+            The loop to use. If None, asyncio.get_event_loop() is used.
+
+    Return the asyncio loop used.
+
+    .. versionadded:: 1.8.0
+    '''
+    import asyncio
+    from kivy.base import EventLoop, ExceptionManager, stopTouchApp
+    from kivy.clock import Clock
+    from kivy.logger import Logger
+
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    # prevent installing more than once
+    if getattr(EventLoop, '_asyncio_loop', None) is not None:
+        return EventLoop._asyncio_loop
+    EventLoop._asyncio_loop = loop
+
+    # exception to raise from the mainloop
+    error = []
+    # asyncio handle and loop time of the next frame, None while a frame is
+    # running
+    next_frame = [None, None]
+
+    def schedule_frame(iterate):
+        # wait for the I/O until the next frame is due
+        delay = Clock._get_sleep_time(EventLoop._frame_idle)
+        if delay > 0:
+            handle = loop.call_later(delay, asyncio_step, iterate)
+        else:
+            handle = loop.call_soon(asyncio_step, iterate)
+        next_frame[:] = handle, loop.time() + delay
+
+    # one iteration of the main loop, scheduled on the asyncio loop
+    def asyncio_step(iterate):
+        next_frame[:] = None, None
+        if EventLoop.quit or EventLoop.status != 'started':
+            loop.stop()
+            return
+        try:
+            iterate()
+        except BaseException as inst:
+            # use exception manager first
+            r = ExceptionManager.handle_exception(inst)
+            if r == ExceptionManager.RAISE:
+                stopTouchApp()
+                error.append(inst)
+                loop.stop()
+                return
+        schedule_frame(iterate)
+
+    def asyncio_mainloop(iterate):
+        # an asyncio callback scheduled Kivy work while waiting for the next
+        # frame, which can be far away in idle mode: run the frame as soon as
+        # the Clock allows it.
+        def asyncio_wakeup():
+            handle, when = next_frame
+            if handle is None:
+                return
+            if loop.time() + Clock._get_sleep_time(
+                    EventLoop._frame_idle) < when:
+                handle.cancel()
+                schedule_frame(iterate)
+
+        # the application stopped, don't wait for the next frame
+        def asyncio_stop(*largs):
+            loop.stop()
+
+        Logger.info('Support: Running the main loop from asyncio')
+        next_frame[:] = loop.call_soon(asyncio_step, iterate), loop.time()
+        Clock._schedule_hook = asyncio_wakeup
+        EventLoop.bind(on_stop=asyncio_stop)
+        try:
+            loop.run_forever()
+        finally:
+            EventLoop.unbind(on_stop=asyncio_stop)
+            Clock._schedule_hook = None
+            if next_frame[0] is not None:
+                next_frame[0].cancel()
+            next_frame[:] = None, None
+        if error:
+            raise error.pop()
+
+    # replace the mainloop used by runTouchApp() when the event loop start
+    def asyncio_install(*largs):
+        window = EventLoop.window
+        if window is None:
+            def run():
+                asyncio_mainloop(EventLoop.idle)
+                EventLoop.exit()
+            EventLoop.run = run
+        else:
+            iterate = getattr(window, '_mainloop', EventLoop.idle)
+            window.mainloop = lambda: asyncio_mainloop(iterate)
+
+    EventLoop.bind(on_start=asyncio_install)
+    return loop
@@ -711,6 +711,27 @@ class AdaptersTestCase(unittest.TestCase):
         apple_data_item = list_adapter.get_data_item(0)
         self.assertTrue(isinstance(apple_data_item, FruitItem))
 
+    def test_list_adapter_append_data(self):
+        list_adapter = ListAdapter(data=['a', 'b'],
+                                   selection_mode='single',
+                                   allow_empty_selection=False,
+                                   cls=ListItemButton)
+
+        view = list_adapter.get_view(1)
+        list_adapter.handle_selection(view)
+        self.assertEqual(list_adapter.selection, [view])
+
+        # appending keeps the cached views and the selection
+        list_adapter.data.append('c')
+        self.assertTrue(list_adapter.get_view(1) is view)
+        self.assertEqual(list_adapter.selection, [view])
+
+        # any other change resets them
+        list_adapter.data.insert(0, 'z')
+        self.assertFalse(list_adapter.get_view(1) is view)
+        self.assertEqual(len(list_adapter.selection), 1)
+        self.assertEqual(list_adapter.selection[0].text, 'z')
+
     def test_list_adapter_selection_mode_multiple_select_list(self):
         list_item_args_converter = \
                 lambda row_index, selectable: {'text': selectable.name,
@@ -0,0 +1,270 @@
+'''
+Cache tests
+===========
+'''
+
+import unittest
+
+
+class FakeTexture(object):
+
+    def __init__(self, width, height, colorfmt='rgba'):
+        self.width = width
+        self.height = height
+        self.colorfmt = colorfmt
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.cache import Cache
+        self.evicted = []
+        Cache.register('test.cache', limit=3,
+                       on_evict=self.on_evict)
+
+    def tearDown(self):
+        from kivy.cache import Cache
+        Cache.set_max_bytes(None)
+        for category in ('test.cache', 'test.cache2'):
+            Cache.remove(category)
+            Cache._categories.pop(category, None)
+            Cache._objects.pop(category, None)
+
+    def on_evict(self, category, key, obj):
+        self.evicted.append((category, key, obj))
+
+    def test_limit(self):
+        from kivy.cache import Cache
+        for i in range(5):
+            Cache.append('test.cache', i, 'obj%d' % i)
+        self.assertEqual(len(Cache._objects['test.cache']), 3)
+        self.assertEqual(Cache.get('test.cache', 0), None)
+        self.assertEqual(Cache.get('test.cache', 1), None)
+        self.assertEqual(Cache.get('test.cache', 4), 'obj4')
+        self.assertEqual(self.evicted, [
+            ('test.cache', 0, 'obj0'), ('test.cache', 1, 'obj1')])
+
+    def test_lru_order(self):
+        from kivy.cache import Cache
+        for i in range(3):
+            Cache.append('test.cache', i, i)
+        # access the oldest one, the next one become the least recently used
+        self.assertEqual(Cache.get('test.cache', 0), 0)
+        Cache.append('test.cache', 3, 3)
+        self.assertEqual(Cache.get('test.cache', 1), None)
+        self.assertEqual(Cache.get('test.cache', 0), 0)
+        # replacing an object makes it the most recently used too
+        Cache.append('test.cache', 2, 'two')
+        Cache.append('test.cache', 4, 4)
+        self.assertEqual(Cache.get('test.cache', 3), None)
+        self.assertEqual(Cache.get('test.cache', 2), 'two')
+        self.assertEqual([x[1] for x in self.evicted], [1, 3])
+
+    def test_lru_order_without_limit(self):
+        from kivy.cache import Cache
+        Cache.register('test.cache2')
+        for i in range(3):
+            Cache.append('test.cache2', i, i)
+        # without limit, getting an object doesn't change the order
+        self.assertEqual(Cache.get('test.cache2', 0), 0)
+        self.assertEqual(list(Cache._objects['test.cache2']), [0, 1, 2])
+        # a global budget can evict it, the order is kept again
+        Cache.set_max_bytes(1024)
+        self.assertEqual(Cache.get('test.cache2', 0), 0)
+        self.assertEqual(list(Cache._objects['test.cache2']), [1, 2, 0])
+
+    def test_remove_does_not_evict(self):
+        from kivy.cache import Cache
+        Cache.append('test.cache', 'a', 1)
+        Cache.append('test.cache', 'b', 2)
+        Cache.remove('test.cache', 'a')
+        Cache.remove('test.cache')
+        self.assertEqual(Cache.get('test.cache', 'b'), None)
+        self.assertEqual(self.evicted, [])
+
+    def test_timeout(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        Cache.append('test.cache', 'a', 1, timeout=1)
+        Cache.append('test.cache', 'b', 2)
+        Cache.get('test.cache', 'a')
+        Clock._last_tick += 2
+        try:
+            Cache._purge_by_timeout(0)
+        finally:
+            Clock._last_tick -= 2
+        self.assertEqual(Cache.get('test.cache', 'a'), None)
+        self.assertEqual(Cache.get('test.cache', 'b'), 2)
+        self.assertEqual(self.evicted, [('test.cache', 'a', 1)])
+
+    def test_sizeof(self):
+        from kivy.cache import Cache
+
+        class FakeLabel(object):
+            texture = FakeTexture(10, 10, 'rgb')
+
+        self.assertEqual(Cache._sizeof(FakeTexture(16, 16)), 1024)
+        self.assertEqual(Cache._sizeof(FakeLabel()), 300)
+        self.assertEqual(Cache._sizeof(FakeLabel), 0)
+        self.assertEqual(Cache._sizeof(42), 0)
+
+    def test_max_bytes(self):
+        from kivy.cache import Cache
+        Cache.register('test.cache', max_bytes=3000,
+                       on_evict=self.on_evict)
+        Cache.append('test.cache', 'a', FakeTexture(16, 16))
+        Cache.append('test.cache', 'b', FakeTexture(16, 16))
+        self.assertEqual(Cache.get_bytes('test.cache'), 2048)
+        Cache.append('test.cache', 'c', FakeTexture(32, 16))
+        self.assertEqual(Cache.get('test.cache', 'a'), None)
+        self.assertEqual(Cache.get_bytes('test.cache'), 3072 - 1024)
+        # the last appended object is kept, even if it's too big
+        Cache.append('test.cache', 'd', FakeTexture(64, 64))
+        self.assertEqual(list(Cache._objects['test.cache'].keys()), ['d'])
+        self.assertEqual(Cache.get_bytes('test.cache'), 16384)
+        Cache.remove('test.cache', 'd')
+        self.assertEqual(Cache.get_bytes('test.cache'), 0)
+
+    def test_global_max_bytes(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        Cache.register('test.cache2', on_evict=self.on_evict)
+        total = Cache.get_bytes()
+        Cache.set_max_bytes(total + 3000)
+        Cache.append('test.cache', 'a', FakeTexture(16, 16))
+        Clock._last_tick += 1
+        Cache.append('test.cache2', 'b', FakeTexture(16, 16))
+        Clock._last_tick += 1
+        Cache.get('test.cache', 'a')
+        Clock._last_tick -= 2
+        self.assertEqual(Cache.get_bytes(), total + 2048)
+        # 'b' is the least recently used object of all the categories
+        Cache.append('test.cache', 'c', FakeTexture(16, 16))
+        self.assertEqual([x[1] for x in self.evicted], ['b'])
+        self.assertEqual(Cache.get_bytes('test.cache2'), 0)
+        self.assertEqual(Cache.get_bytes(), total + 2048)
+
+    def test_stats(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        for i in range(4):
+            Cache.append('test.cache', i, FakeTexture(16, 16), timeout=1)
+        Cache.get('test.cache', 0)
+        Cache.get('test.cache', 1)
+        Cache.get('test.cache', 2)
+        Clock._last_tick += 2
+        try:
+            Cache._purge_by_timeout(0)
+        finally:
+            Clock._last_tick -= 2
+        self.assertEqual(Cache.get_stats('test.cache'), {
+            'hits': 2, 'misses': 1, 'inserts': 4, 'evictions': 1,
+            'timeouts': 3, 'objects': 0, 'bytes': 0})
+        self.assertIn('test.cache', Cache.get_stats())
+        Cache.reset_stats()
+        self.assertEqual(Cache.get_stats('test.cache')['hits'], 0)
+
+    def test_timeout_slow_frame(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        Cache.register('test.cache', timeout=1)
+        Cache.append('test.cache', 'a', 1)
+        Cache.append('test.cache', 'b', 2)
+        last_tick, frametime = Clock._last_tick, Clock._dt
+        try:
+            # a 5s frame after 'a' has been used: 'a' is kept
+            Clock._last_tick += 5
+            Clock._dt = 5
+            Cache.get('test.cache', 'a')
+            Clock._last_tick += 5
+            Cache._purge_by_timeout(5)
+            self.assertEqual(Cache.get_lastaccess('test.cache', 'a'),
+                             last_tick + 5)
+            self.assertEqual(Cache.get('test.cache', 'b'), None)
+            # the next frame is fast, 'a' has not been used for 5s
+            Clock._last_tick += 1. / 60
+            Clock._dt = 1. / 60
+            Cache._purge_by_timeout(1. / 60)
+            self.assertEqual(Cache.get('test.cache', 'a'), None)
+        finally:
+            Clock._last_tick, Clock._dt = last_tick, frametime
+        self.assertEqual(Cache._categories['test.cache']['timeout'], 1)
+        self.assertEqual(Cache.get_stats('test.cache')['timeouts'], 2)
+
+    def test_trim(self):
+        from kivy.cache import Cache
+        Cache.register('test.cache', priority=1)
+        Cache.register('test.cache2')
+        for i in range(4):
+            Cache.append('test.cache', i, FakeTexture(16, 16))
+            Cache.append('test.cache2', i, FakeTexture(16, 16))
+        Cache.register('test.cache3')
+        for i in range(4):
+            Cache.append('test.cache3', i, i)
+        trimmed = []
+
+        def trim_callback(level):
+            trimmed.append(level)
+            return 100
+
+        Cache.add_trim_callback(trim_callback)
+        try:
+            other = Cache.get_bytes() - 8192
+            # the lowest priority is trimmed first
+            freed = Cache.trim((4096 + other) / float(Cache.get_bytes()))
+            self.assertEqual(freed, 4096 + other + 100)
+            self.assertEqual(Cache.get_bytes('test.cache'), 4096)
+            self.assertEqual(Cache.get_bytes('test.cache2'), 0)
+            self.assertEqual(len(Cache._objects['test.cache3']), 2)
+            self.assertEqual(Cache.get('test.cache3', 3), 3)
+            Cache.trim(1.)
+            self.assertEqual(Cache.get_bytes(), 0)
+            self.assertEqual(len(Cache._objects['test.cache3']), 0)
+            self.assertEqual(len(trimmed), 2)
+        finally:
+            Cache.remove_trim_callback(trim_callback)
+            Cache.remove('test.cache3')
+            Cache._categories.pop('test.cache3', None)
+            Cache._objects.pop('test.cache3', None)
+
+    def test_trim_match_cache_level(self):
+        from kivy.lang import Builder, _trim_match_cache
+        cache = Builder._match_cache
+        saved = dict(cache)
+        try:
+            cache.clear()
+            for i in range(10):
+                cache[(i, None, ())] = []
+            # a light trim only forgets a part of the matches
+            self.assertTrue(_trim_match_cache(.2) > 0)
+            self.assertEqual(len(cache), 8)
+            _trim_match_cache(1.)
+            self.assertEqual(len(cache), 0)
+        finally:
+            cache.clear()
+            cache.update(saved)
+
+    def test_trim_text_cache_level(self):
+        try:
+            from kivy.core.text import LabelBase, _trim_cache
+        except Exception:
+            self.skipTest('no text provider')
+        saved = (dict(LabelBase._cache_glyphs), dict(LabelBase._fonts_cache))
+        try:
+            LabelBase._cache_glyphs.clear()
+            LabelBase._fonts_cache.clear()
+            for i in range(10):
+                LabelBase._cache_glyphs['font%d' % i] = {'a': (10, 10)}
+                LabelBase._fonts_cache['font%d' % i] = 'font%d.ttf' % i
+            # a light trim only forgets a part of the fonts
+            self.assertTrue(_trim_cache(.2) > 0)
+            self.assertEqual(len(LabelBase._cache_glyphs), 8)
+            self.assertEqual(len(LabelBase._fonts_cache), 8)
+            _trim_cache(1.)
+            self.assertEqual(len(LabelBase._cache_glyphs), 0)
+            self.assertEqual(len(LabelBase._fonts_cache), 0)
+        finally:
+            LabelBase._cache_glyphs.clear()
+            LabelBase._cache_glyphs.update(saved[0])
+            LabelBase._fonts_cache.clear()
+            LabelBase._fonts_cache.update(saved[1])
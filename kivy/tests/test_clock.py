@@ -19,7 +19,7 @@ class ClockTestCase(unittest.TestCase):
         from kivy.clock import Clock
         global counter
         counter = 0
-        Clock._events = {}
+        Clock._clear_events()
 
     def test_schedule_once(self):
         from kivy.clock import Clock
@@ -73,3 +73,312 @@ class ClockTestCase(unittest.TestCase):
         Clock.unschedule(callback)
         Clock.tick()
         self.assertEqual(counter, 0)
+
+    def test_schedule_interval(self):
+        from kivy.clock import Clock
+        Clock.schedule_interval(callback, 0)
+        Clock.tick()
+        Clock.tick()
+        self.assertEqual(counter, 2)
+        Clock.unschedule(callback)
+        Clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_unschedule_event(self):
+        from kivy.clock import Clock
+        event = Clock.schedule_once(callback)
+        Clock.unschedule(event)
+        Clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_schedule_order(self):
+        from kivy.clock import Clock
+        order = []
+        Clock.schedule_once(lambda dt: order.append(2), .2)
+        Clock.schedule_once(lambda dt: order.append(1), .1)
+        Clock.schedule_once(lambda dt: order.append(0))
+        Clock._last_tick += 1.
+        Clock._process_events()
+        Clock._last_tick -= 1.
+        self.assertEqual(order, [0, 1, 2])
+
+    def test_schedule_once_from_callback(self):
+        from kivy.clock import Clock
+
+        def reschedule(dt):
+            callback(dt)
+            Clock.schedule_once(reschedule)
+
+        Clock.schedule_once(reschedule)
+        Clock.tick()
+        self.assertEqual(counter, 1)
+        Clock.tick()
+        self.assertEqual(counter, 2)
+        Clock.unschedule(reschedule)
+
+    def test_trigger(self):
+        from kivy.clock import Clock
+        trigger = Clock.create_trigger(callback)
+        trigger()
+        trigger()
+        Clock.tick()
+        self.assertEqual(counter, 1)
+        trigger()
+        Clock.unschedule(trigger)
+        Clock.tick()
+        self.assertEqual(counter, 1)
+        trigger()
+        Clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_idle_events(self):
+        from kivy.clock import Clock
+        for x in range(100):
+            Clock.schedule_interval(callback, 100.)
+        Clock.schedule_once(callback)
+        Clock.tick()
+        self.assertEqual(counter, 1)
+        self.assertEqual(len(Clock._events_heap), 100)
+
+    def test_profiling(self):
+        from kivy.clock import Clock
+        Clock.reset_profile()
+        Clock.schedule_once(callback)
+        Clock.tick()
+        self.assertEqual(Clock.get_profile(), [])
+        Clock.enable_profiling()
+        try:
+            Clock.schedule_once(callback)
+            Clock.schedule_once(callback)
+            Clock.tick()
+        finally:
+            Clock.disable_profiling()
+        profile = Clock.get_profile()
+        self.assertEqual(len(profile), 1)
+        name, calls, total, maximum = profile[0]
+        self.assertTrue(name.endswith('callback'))
+        self.assertEqual(calls, 2)
+        self.assertTrue(total >= maximum >= 0)
+        Clock.reset_profile()
+        self.assertEqual(Clock.get_profile(), [])
+
+    def test_schedule_budgeted(self):
+        from kivy.clock import Clock
+
+        def task(steps):
+            for x in range(steps):
+                callback(0)
+                yield
+
+        Clock.schedule_budgeted(task(3), 0)
+        Clock.tick()
+        self.assertEqual(counter, 1)
+        Clock.tick()
+        Clock.tick()
+        self.assertEqual(counter, 3)
+        self.assertEqual(len(Clock._budgeted), 1)
+        Clock.tick()
+        self.assertEqual(len(Clock._budgeted), 0)
+
+    def test_schedule_budgeted_whole_frame(self):
+        from kivy.clock import Clock
+
+        def task(steps):
+            for x in range(steps):
+                callback(0)
+                yield
+
+        # a few cheap steps fit in a single frame
+        Clock.schedule_budgeted(task(5), 1.)
+        Clock.tick()
+        self.assertEqual(counter, 5)
+        self.assertEqual(len(Clock._budgeted), 0)
+
+    def test_unschedule_budgeted(self):
+        from kivy.clock import Clock
+
+        def task():
+            while True:
+                callback(0)
+                yield
+
+        gen = Clock.schedule_budgeted(task(), 0)
+        Clock.tick()
+        Clock.unschedule_budgeted(gen)
+        Clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_idle_tick(self):
+        from kivy.clock import Clock
+        from time import time
+        idle_fps = Clock._idle_fps
+        Clock._idle_fps = 5.
+        try:
+            Clock.tick()
+            Clock.schedule_once(callback, .1)
+            self.assertAlmostEqual(Clock.get_next_deadline(),
+                                   Clock.get_time() + .1, places=3)
+            start = time()
+            Clock.tick(True)
+            self.assertTrue(time() - start >= .08)
+            self.assertEqual(counter, 1)
+            # nothing scheduled, sleep until the next input poll
+            start = time()
+            Clock.tick(True)
+            self.assertTrue(time() - start >= .15)
+        finally:
+            Clock._idle_fps = idle_fps
+
+    def test_schedule_from_thread(self):
+        from kivy.clock import Clock
+        from threading import Thread
+        results = []
+
+        def compute(dt):
+            callback(dt)
+            return 42
+
+        def run():
+            results.append(Clock.schedule_from_thread(compute))
+            Clock.schedule_once(callback)
+
+        thread = Thread(target=run)
+        thread.start()
+        thread.join()
+        # nothing is executed before the main thread tick
+        future = results[0]
+        self.assertFalse(future.done())
+        self.assertEqual(counter, 0)
+        Clock.tick()
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(0), 42)
+        self.assertEqual(counter, 2)
+
+    def test_schedule_from_thread_exception(self):
+        from kivy.clock import Clock
+        from threading import Thread
+        futures = []
+
+        def fail(dt):
+            raise ValueError('failed')
+
+        def run():
+            futures.append(Clock.schedule_from_thread(callback))
+            futures.append(Clock.schedule_from_thread(fail))
+            # an internal call, like an unschedule() done from the thread
+            Clock._thread_queue.append(fail)
+            futures.append(Clock.schedule_from_thread(callback))
+
+        thread = Thread(target=run)
+        thread.start()
+        thread.join()
+        # the failing call doesn't stop the calls submitted after it
+        Clock.tick()
+        self.assertEqual(counter, 2)
+        self.assertTrue(all([future.done() for future in futures]))
+        self.assertEqual(futures[0].exception(0), None)
+        self.assertTrue(isinstance(futures[1].exception(0), ValueError))
+        self.assertRaises(ValueError, futures[1].result, 0)
+        self.assertEqual(futures[2].exception(0), None)
+
+    def test_schedule_from_thread_cancel(self):
+        from kivy.clock import Clock
+        future = Clock.schedule_from_thread(callback)
+        self.assertTrue(future.cancel())
+        Clock.tick()
+        self.assertEqual(counter, 0)
+        self.assertTrue(future.cancelled())
+        self.assertRaises(RuntimeError, future.result, 0)
+
+    def test_unschedule_from_thread(self):
+        from kivy.clock import Clock
+        from threading import Thread
+        Clock.schedule_interval(callback, 0)
+        Clock.tick()
+        thread = Thread(target=Clock.unschedule, args=(callback, ))
+        thread.start()
+        thread.join()
+        Clock.tick()
+        Clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_virtual_time(self):
+        from kivy.clock import Clock
+        from time import time
+        Clock.enable_virtual_time(.1)
+        try:
+            Clock.schedule_once(callback, 1.)
+            start = Clock.get_time()
+            real_start = time()
+            for x in range(9):
+                Clock.tick()
+            self.assertEqual(counter, 0)
+            Clock.tick()
+            self.assertEqual(counter, 1)
+            self.assertAlmostEqual(Clock.get_time() - start, 1., places=5)
+            self.assertAlmostEqual(Clock.frametime, .1, places=5)
+            # the clock never sleeps
+            for x in range(100):
+                Clock.tick()
+            self.assertTrue(time() - real_start < 1.)
+        finally:
+            Clock.disable_virtual_time()
+        # the time continues from the virtual time
+        last_tick = Clock.get_time()
+        Clock.tick()
+        self.assertTrue(0 < Clock.frametime < 1.)
+        self.assertTrue(Clock.get_time() > last_tick)
+
+    def test_time_source(self):
+        from kivy.clock import Clock
+        # the clock would wait forever for this source to reach maxfps
+        max_fps = Clock._max_fps
+        Clock._max_fps = 0
+        now = [1000.]
+        Clock.set_time_source(lambda: now[0])
+        try:
+            Clock.tick()
+            last_tick = Clock.get_time()
+            Clock.schedule_once(callback, 2.)
+            now[0] += 1.
+            Clock.tick()
+            self.assertAlmostEqual(Clock.get_time() - last_tick, 1., places=5)
+            self.assertEqual(counter, 0)
+            now[0] += 1.
+            Clock.tick()
+            self.assertEqual(counter, 1)
+        finally:
+            Clock.set_time_source()
+            Clock._max_fps = max_fps
+
+    def test_schedule_once_coalesce(self):
+        from kivy.clock import Clock
+        event = Clock.schedule_once(callback, coalesce=True)
+        self.assertIs(Clock.schedule_once(callback, coalesce=True), event)
+        self.assertIsNot(Clock.schedule_once(callback, 1., coalesce=True),
+                         event)
+        Clock.tick()
+        self.assertEqual(counter, 1)
+        Clock.unschedule(callback)
+
+    def test_schedule_once_coalesce_from_callback(self):
+        from kivy.clock import Clock
+
+        def reschedule(dt):
+            callback(dt)
+            if counter < 2:
+                Clock.schedule_once(reschedule, coalesce=True)
+
+        Clock.schedule_once(reschedule, coalesce=True)
+        Clock.tick()
+        Clock.tick()
+        Clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_event_slots(self):
+        from kivy.clock import Clock
+        event = Clock.schedule_once(callback)
+        self.assertFalse(hasattr(event, '__dict__'))
+        # the callback is weak-referenced as soon as it's scheduled
+        self.assertIsNone(event.callback)
+        Clock.unschedule(event)
@@ -1,4 +1,5 @@
 import unittest
+import os
 
 
 class ImageTestCase(unittest.TestCase):
@@ -17,3 +18,24 @@ class ImageTestCase(unittest.TestCase):
         i1 = self.cls(self.image, keep_data=True)
         if not i1._image._data[0].data:
             self.fail('Image has no data even with keep_data = True')
+
+    def test_disk_cache(self):
+        from kivy.core.image import ImageLoader, ImageDiskCache, \
+            ImageLoaderDiskCache
+        import tempfile
+        import shutil
+        directory = tempfile.mkdtemp()
+        ImageDiskCache.enable(directory)
+        try:
+            im1 = ImageLoader.load(self.image)
+            self.assertNotIsInstance(im1, ImageLoaderDiskCache)
+            im2 = ImageLoader.load(self.image)
+            self.assertIsInstance(im2, ImageLoaderDiskCache)
+            self.assertEqual(im1._data[0].size, im2._data[0].size)
+            self.assertEqual(im1._data[0].fmt, im2._data[0].fmt)
+            self.assertEqual(im1._data[0].data, im2._data[0].data)
+            ImageDiskCache.clear()
+            self.assertEqual(os.listdir(directory), [])
+        finally:
+            ImageDiskCache.disable()
+            shutil.rmtree(directory)
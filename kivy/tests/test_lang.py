@@ -224,3 +224,209 @@ class LangTestCase(unittest.TestCase):
         self.assertTrue('on_press' in wid.binded_func)
         wid.binded_func['on_press']()
         self.assertEquals(wid.a, 1)
+
+    def test_disk_cache(self):
+        import os
+        import shutil
+        import tempfile
+        from kivy.lang import ParserDiskCache
+        directory = tempfile.mkdtemp()
+        filename = os.path.join(directory, 'test.kv')
+        with open(filename, 'w') as fd:
+            fd.write('''#:set answer 42
+<TestClass>:
+    obj: answer
+    on_press:
+        self.a = 1
+    TestClass2:
+        id: child
+        obj: root.obj
+''')
+        ParserDiskCache.enable(os.path.join(directory, 'cache'))
+        try:
+            # the second load is done from the cache
+            for x in range(2):
+                Builder = self.import_builder()
+                Builder.load_file(filename)
+                wid = TestClass()
+                Builder.apply(wid)
+                self.assertEqual(wid.obj, 42)
+                self.assertEqual(wid.children[0].obj, 42)
+                wid.binded_func['on_press']()
+                self.assertEqual(wid.a, 1)
+                self.assertEqual(
+                    len(os.listdir(ParserDiskCache.directory)), 1)
+        finally:
+            ParserDiskCache.disable()
+            shutil.rmtree(directory)
+
+    def test_compiled_rules(self):
+        from kivy.tools.kvcompiler import compile_string
+        source = compile_string('''#:set answer 42
+<TestClass>:
+    obj: answer
+    on_press:
+        self.a = args
+    TestClass2:
+        id: child
+        obj: root.obj + 1
+''', register=False)
+        namespace = {'__name__': 'test_compiled_rules'}
+        exec(compile(source, '<compiled>', 'exec'), namespace)
+
+        Builder = self.import_builder()
+        namespace['register'](Builder)
+        wid = TestClass()
+        Builder.apply(wid)
+        self.assertEqual(wid.obj, 42)
+        child = wid.children[0]
+        self.assertTrue(isinstance(child, TestClass2))
+        self.assertEqual(child.obj, 43)
+        self.assertTrue(wid.ids['child'] is child.proxy_ref)
+        wid.binded_func['on_press'](1, 2)
+        self.assertEqual(wid.a, (1, 2))
+        # the dependencies are bound
+        self.assertTrue('obj' in wid.binded_func)
+
+    def test_expressions(self):
+        Builder = self.import_builder()
+        Builder.load_string('''#:set offset 10
+<TestClass>:
+    obj: [root.obj2 + offset + x for x in (1, 2)]
+    TestClass2:
+        id: child
+        obj: child.uid == self.uid and len(str(root.obj))
+''')
+        wid = TestClass()
+        wid.obj2 = 1
+        Builder.apply(wid)
+        self.assertEqual(wid.obj, [12, 13])
+        child = wid.children[0]
+        self.assertEqual(child.obj, len('[12, 13]'))
+
+        # the bound functions evaluate the expression again
+        wid.obj2 = 2
+        wid.binded_func['obj2']()
+        self.assertEqual(wid.obj, [13, 14])
+
+        # the expressions are compiled once per set of ids
+        from kivy.lang import ParserRuleProperty
+        wid2 = TestClass()
+        wid2.obj2 = 0
+        Builder.apply(wid2)
+        self.assertEqual(wid2.obj, [11, 12])
+        for selector, rule in Builder.rules:
+            prop = rule.properties['obj']
+            self.assertTrue(isinstance(prop, ParserRuleProperty))
+            self.assertEqual(len(prop.co_factories), 1)
+
+        # the global names are not modified by the compilation, and a name
+        # set later is seen by the compiled expressions
+        from kivy.lang import global_idmap
+        self.assertFalse('__builtins__' in global_idmap)
+        Builder.load_string('#:set offset 20')
+        wid2.binded_func['obj2']()
+        self.assertEqual(wid2.obj, [21, 22])
+
+    def test_sync_coalesce(self):
+        from kivy.lang import create_handler, ParserRuleProperty
+        from kivy.utils import QueryDict
+        Builder = self.import_builder()
+        Builder.sync()
+        Builder.get_sync_stats(reset=True)
+
+        wid = TestClass()
+        wid.a = 1
+        wid.b = 2
+        instr = TestClass2()
+        prop = ParserRuleProperty(QueryDict(filename=None), 0, 'obj',
+                                  'self.a + self.b')
+        prop.precompile()
+        instr.obj = create_handler(wid, instr, 'obj', prop.co_value, prop,
+                                   {}, True)
+        self.assertEqual(instr.obj, 3)
+
+        # the expression is executed once, at the next sync
+        wid.a = 10
+        wid.binded_func['a']()
+        wid.binded_func['b']()
+        wid.binded_func['a']()
+        self.assertEqual(instr.obj, 3)
+        Builder.sync()
+        self.assertEqual(instr.obj, 12)
+        self.assertEqual(Builder.get_sync_stats(),
+                         {'syncs': 1, 'calls': 1, 'coalesced': 2})
+        Builder.sync()
+        self.assertEqual(Builder.get_sync_stats(reset=True)['syncs'], 1)
+        self.assertEqual(Builder.get_sync_stats()['calls'], 0)
+
+    def test_match_index(self):
+        Builder = self.import_builder()
+        Builder.load_string('''
+<BaseClass>:
+    obj: 'base'
+<TestClass,#first>:
+    obj: 'name'
+<.big>:
+    obj: 'cls'
+<-TestClass2>:
+    obj: 'avoid'
+''', filename='a.kv')
+
+        def match_all(widget):
+            # the matching done by the selectors themselves
+            rules = []
+            for selector, rule in Builder.rules:
+                if selector.match(widget):
+                    if rule.avoid_previous_rules:
+                        del rules[:]
+                    rules.append(rule)
+            return rules
+
+        def values(rules):
+            return [list(rule.properties.values())[0].value
+                    for rule in rules]
+
+        wid = TestClass()
+        wid.id = 'First'
+        wid.cls = ['big']
+        wid2 = TestClass2()
+        wid3 = TestClass3()
+        for widget in (wid, wid2, wid3):
+            self.assertEqual(Builder.match(widget), match_all(widget))
+        self.assertEqual(values(Builder.match(wid)),
+                         ["'base'", "'name'", "'name'", "'cls'"])
+        self.assertEqual(values(Builder.match(wid2)), ["'avoid'"])
+
+        # loading a file only forgets the matches it changes
+        Builder.load_string('''
+<TestClass3>:
+    obj: 'new'
+''', filename='b.kv')
+        cache = Builder._match_cache
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(values(Builder.match(wid3)), ["'base'", "'new'"])
+        Builder.unload_file('b.kv')
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(values(Builder.match(wid3)), ["'base'"])
+        Builder.unload_file('a.kv')
+        self.assertEqual(Builder.rules, [])
+        self.assertEqual(Builder.match(wid), [])
+
+    def test_match_same_name_subclass(self):
+        Builder = self.import_builder()
+        Builder.load_string('''
+<TestClass>:
+    obj: 'name'
+    TestClass2:
+<.big>:
+    obj: 'cls'
+''')
+        # a subclass reusing the name of its base class, the rules apply once
+        wid = type('TestClass', (TestClass, ), {})()
+        wid.cls = ['big', 'big']
+        rules = Builder.match(wid)
+        self.assertEqual(len(rules), 2)
+        self.assertEqual(len(set(rules)), 2)
+        Builder.apply(wid)
+        self.assertEqual(len(wid.children), 1)
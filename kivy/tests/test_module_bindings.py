@@ -0,0 +1,63 @@
+'''
+Bindings module tests
+=====================
+'''
+
+import gc
+import json
+import os
+import tempfile
+import unittest
+from kivy.event import EventDispatcher
+from kivy.properties import NumericProperty, ObjectProperty
+
+
+class Model(EventDispatcher):
+    value = NumericProperty(0)
+    parent = ObjectProperty(None, allownone=True)
+
+    def on_value_changed(self, instance, value):
+        pass
+
+
+class BindingsTestCase(unittest.TestCase):
+
+    def test_collect(self):
+        from kivy.modules import bindings
+
+        model = Model()
+        views = [Model() for x in range(3)]
+        for view in views:
+            model.bind(value=view.on_value_changed)
+        dead = Model()
+        model.bind_weak(value=dead.on_value_changed)
+        del dead
+        gc.collect()
+
+        report = bindings.collect(fanout=2)
+        self.assertTrue(report['instances'] >= 4)
+        self.assertTrue(report['classes']['Model']['observers']['value'] >= 4)
+        fanout = [x for x in report['fanout'] if x['uid'] == model.uid]
+        self.assertEqual(fanout, [{'class': 'Model', 'uid': model.uid,
+                                   'name': 'value', 'observers': 4}])
+        dead = [x for x in report['dead'] if x['uid'] == model.uid]
+        self.assertEqual(len(dead), 1)
+
+        # the views are in another tree than the model
+        detached = [x for x in report['detached'] if x['uid'] == model.uid]
+        self.assertEqual(len(detached), 3)
+        for view in views:
+            view.parent = model
+        report = bindings.collect(fanout=2)
+        detached = [x for x in report['detached'] if x['uid'] == model.uid]
+        self.assertEqual(detached, [])
+
+        fd, filename = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            bindings.dump(report, filename)
+            with open(filename) as fd:
+                self.assertEqual(json.load(fd)['instances'],
+                                 report['instances'])
+        finally:
+            os.unlink(filename)
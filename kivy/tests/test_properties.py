@@ -391,3 +391,141 @@ class PropertiesTestCase(unittest.TestCase):
 
         bnp.set(wid, -10)
         self.assertEqual(bnp.get(wid), -5)
+
+    def test_batch_update(self):
+        from kivy.properties import NumericProperty, ReferenceListProperty
+
+        class Point(EventDispatcher):
+            x = NumericProperty(0)
+            y = NumericProperty(0)
+            pos = ReferenceListProperty(x, y)
+
+        calls = []
+        p = Point()
+        p.bind(x=lambda obj, value: calls.append(('x', value)),
+               pos=lambda obj, value: calls.append(('pos', list(value))))
+        with p.batch_update():
+            p.x = 1
+            p.y = 2
+            p.x = 3
+            with p.batch_update():
+                p.y = 4
+            # values are up to date, observers are not called yet
+            self.assertEqual(list(p.pos), [3, 4])
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [('x', 3), ('pos', [3, 4])])
+
+        del calls[:]
+        with EventDispatcher.hold_dispatch():
+            with p.batch_update():
+                p.x = 5
+            p.y = 6
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [('x', 5), ('pos', [5, 6])])
+
+        # no more batch
+        del calls[:]
+        p.x = 7
+        self.assertEqual(calls, [('pos', [7, 6]), ('x', 7)])
+
+    def test_bind_weak(self):
+        import gc
+        from kivy.properties import NumericProperty
+
+        class Source(EventDispatcher):
+            value = NumericProperty(0)
+
+        class Listener(object):
+            def __init__(self, calls):
+                self.calls = calls
+
+            def on_value(self, instance, value):
+                self.calls.append(value)
+
+        calls = []
+        source = Source()
+        listener = Listener(calls)
+        source.bind_weak(value=listener.on_value)
+        source.value = 1
+        self.assertEqual(calls, [1])
+
+        # unbind works as for a strong binding
+        source.unbind(value=listener.on_value)
+        source.value = 2
+        self.assertEqual(calls, [1])
+
+        # the binding doesn't keep the listener alive
+        source.bind_weak(value=listener.on_value)
+        observer = source.get_property_observers('value')[0]
+        self.assertFalse(observer.is_dead())
+        del listener
+        gc.collect()
+        self.assertTrue(observer.is_dead())
+        source.value = 3
+        self.assertEqual(calls, [1])
+        self.assertEqual(source.get_property_observers('value'), [])
+
+    def test_lazy_storage(self):
+        from kivy.properties import NumericProperty, ReferenceListProperty
+
+        class Point(EventDispatcher):
+            x = NumericProperty(0)
+            y = NumericProperty(0)
+            pos = ReferenceListProperty(x, y)
+
+        # the dependent property is created after an observer of x, but is
+        # still updated before it
+        values = []
+        p = Point()
+        p.bind(x=lambda *largs: values.append(list(p.pos)))
+        p.x = 1
+        self.assertEqual(values, [[1, 0]])
+        p.x = 2
+        self.assertEqual(values, [[1, 0], [2, 0]])
+
+        # the storage of the other instances is not shared
+        p2 = Point(y=3)
+        self.assertEqual(p2.pos, [0, 3])
+        self.assertEqual(p.pos, [2, 0])
+
+    def test_observable_last_op(self):
+        from kivy.properties import ListProperty, DictProperty
+
+        class Model(EventDispatcher):
+            items = ListProperty([])
+            attrs = DictProperty({})
+
+        ops = []
+        m = Model()
+        m.bind(items=lambda obj, value: ops.append(value.last_op),
+               attrs=lambda obj, value: ops.append(value.last_op))
+
+        m.items.append(1)
+        m.items.extend([2, 3])
+        m.items.insert(-1, 4)
+        m.items[1:3] = [5]
+        del m.items[0]
+        m.items.pop()
+        m.items.sort()
+        m.items = [1, 2]
+        self.assertEqual(ops, [
+            ('append', 0, [1], []),
+            ('extend', 1, [2, 3], []),
+            ('insert', 2, [4], []),
+            ('__setitem__', 1, [5], [2, 4]),
+            ('__delitem__', 0, [], [1]),
+            ('pop', 1, [], [3]),
+            ('sort', None, None, None),
+            None])
+        self.assertEqual(m.items.last_op, None)
+
+        del ops[:]
+        m.attrs['a'] = 1
+        m.attrs.update(b=2)
+        m.attrs.pop('a')
+        m.attrs.clear()
+        self.assertEqual(ops, [
+            ('__setitem__', ('a', )),
+            ('update', ('b', )),
+            ('pop', ('a', )),
+            ('clear', None)])
@@ -0,0 +1,105 @@
+'''
+Support tests
+=============
+'''
+
+import unittest
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+class EventListener(object):
+    # the main loop stops if nobody listens to the events
+    pass
+
+
+@unittest.skipIf(asyncio is None, 'asyncio is not available')
+class AsyncioLoopTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.base import EventLoop
+        from kivy.clock import Clock
+        from kivy.support import install_asyncio_loop
+        Clock._clear_events()
+        self.listener = EventListener()
+        EventLoop.add_event_listener(self.listener)
+        self.window = EventLoop.window
+        EventLoop.window = None
+        self.observers = list(EventLoop.get_property_observers('on_start'))
+        self.idle_fps = Clock._idle_fps
+        self.loop = asyncio.new_event_loop()
+        install_asyncio_loop(self.loop)
+
+    def tearDown(self):
+        from kivy.base import EventLoop
+        from kivy.clock import Clock
+        # uninstall the asyncio loop
+        EventLoop.get_property_observers('on_start')[:] = self.observers
+        EventLoop._asyncio_loop = None
+        EventLoop.__dict__.pop('run', None)
+        EventLoop.window = self.window
+        EventLoop.remove_event_listener(self.listener)
+        Clock._idle_fps = self.idle_fps
+        Clock._clear_events()
+        self.loop.close()
+
+    def run_app(self, timeout=5):
+        from kivy.base import EventLoop
+        # stop the test if the application doesn't stop the loop
+        failsafe = self.loop.call_later(timeout, self.loop.stop)
+        EventLoop.start()
+        EventLoop.run()
+        failsafe.cancel()
+        self.assertEqual(EventLoop.status, 'closed')
+
+    def test_install_asyncio_loop(self):
+        from kivy.base import stopTouchApp
+        from kivy.clock import Clock
+        frames = []
+        calls = []
+
+        def asyncio_callback():
+            calls.append(self.loop.time())
+            if len(calls) < 3:
+                self.loop.call_later(.01, asyncio_callback)
+
+        def clock_callback(dt):
+            frames.append(dt)
+            if len(frames) == 5:
+                self.loop.call_soon(asyncio_callback)
+            if len(calls) == 3:
+                stopTouchApp()
+                return False
+
+        Clock.schedule_interval(clock_callback, 0)
+        self.run_app()
+        self.assertTrue(len(frames) > 5)
+        self.assertEqual(len(calls), 3)
+        # stopping the application stopped the asyncio loop
+        self.assertFalse(self.loop.is_running())
+
+    def test_asyncio_wakeup(self):
+        from kivy.base import stopTouchApp
+        from kivy.clock import Clock
+        # a frame every 2s when nothing happens
+        Clock._idle_fps = .5
+        times = []
+
+        def clock_callback(dt):
+            times.append(self.loop.time())
+            stopTouchApp()
+
+        def asyncio_callback():
+            times.append(self.loop.time())
+            Clock.schedule_once(clock_callback)
+
+        self.loop.call_later(.1, asyncio_callback)
+        start = self.loop.time()
+        self.run_app()
+        self.assertEqual(len(times), 2)
+        # the Kivy work scheduled from asyncio didn't wait for the idle frame
+        self.assertTrue(times[1] - times[0] < .5)
+        self.assertTrue(self.loop.time() - start < 1)
@@ -0,0 +1,39 @@
+'''
+WeakMethod tests
+================
+'''
+
+import gc
+import unittest
+
+
+class Target(object):
+
+    def method(self):
+        return 'method'
+
+
+def function():
+    return 'function'
+
+
+class WeakMethodTestCase(unittest.TestCase):
+
+    def test_bound_method(self):
+        from kivy.weakmethod import WeakMethod
+        target = Target()
+        ref = WeakMethod(target.method)
+        self.assertFalse(ref.is_dead())
+        self.assertEqual(ref()(), 'method')
+
+        # the target is collected: the reference is dead, and nothing raises
+        del target
+        gc.collect()
+        self.assertTrue(ref.is_dead())
+        self.assertEqual(ref(), None)
+
+    def test_function(self):
+        from kivy.weakmethod import WeakMethod
+        ref = WeakMethod(function)
+        self.assertFalse(ref.is_dead())
+        self.assertEqual(ref()(), 'function')
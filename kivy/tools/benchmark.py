@@ -22,7 +22,17 @@ from kivy.uix.widget import Widget
 from kivy.graphics import RenderContext
 from kivy.input.motionevent import MotionEvent
 from kivy.cache import Cache
-from kivy.clock import Clock
+from kivy.clock import Clock, ClockEvent
+from kivy.base import EventLoop
+from kivy.event import EventDispatcher
+from kivy.properties import NumericProperty
+from kivy.lang import Builder, BuilderBase
+from kivy.tools.kvcompiler import compile_string
+
+try:
+    from time import process_time
+except ImportError:
+    from time import clock as process_time
 
 clockfn = time
 if sys.platform == 'win32':
@@ -33,6 +43,26 @@ class FakeMotionEvent(MotionEvent):
     pass
 
 
+class ClockEventCounter(object):
+    # count the ClockEvent created while the counter is active, by wrapping
+    # the constructor: these are the allocations done by the clock
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        self.init = init = ClockEvent.__dict__['__init__']
+
+        def counted_init(*largs, **kwargs):
+            self.count += 1
+            init(*largs, **kwargs)
+        ClockEvent.__init__ = counted_init
+        return self
+
+    def __exit__(self, *largs):
+        ClockEvent.__init__ = self.init
+
+
 class bench_widget_creation:
     '''Widget: creation (10000 Widget)'''
 
@@ -152,6 +182,327 @@ class bench_button_creation_with_tick:
         Clock.tick()
 
 
+class bench_clock_tick_idle_events:
+    '''Clock: 1000 ticks with 10000 idle events scheduled'''
+
+    def __init__(self):
+        for x in range(10000):
+            Clock.schedule_interval(self.callback, 3600.)
+
+    def callback(self, dt):
+        pass
+
+    def run(self):
+        try:
+            for x in range(1000):
+                Clock.tick()
+        finally:
+            Clock.unschedule(self.callback)
+
+
+class bench_clock_schedule_once:
+    '''Clock: 100000 schedule_once of the same callback + 1 tick'''
+
+    coalesce = False
+
+    def callback(self, dt):
+        pass
+
+    def run(self):
+        schedule_once = Clock.schedule_once
+        callback = self.callback
+        coalesce = self.coalesce
+        for x in range(100000):
+            schedule_once(callback, coalesce=coalesce)
+        Clock.tick()
+
+
+class bench_clock_schedule_once_coalesce(bench_clock_schedule_once):
+    '''Clock: 100000 coalesced schedule_once of the same callback + 1 tick'''
+
+    coalesce = True
+
+
+class _DispatchBenchObject(EventDispatcher):
+    value = NumericProperty(0)
+
+    __events__ = ('on_event', )
+
+    def on_event(self):
+        pass
+
+
+class _DispatchBenchObserver(object):
+
+    def callback(self, *largs):
+        pass
+
+
+class bench_property_dispatch_0:
+    '''Properties: 100000 changes of a property with 0 observer'''
+
+    observers = 0
+
+    def __init__(self):
+        self.obj = _DispatchBenchObject()
+        self.handlers = [_DispatchBenchObserver()
+                         for x in range(self.observers)]
+        for observer in self.handlers:
+            self.obj.bind(value=observer.callback)
+
+    def run(self):
+        obj = self.obj
+        for x in range(100000):
+            obj.value = x
+
+
+class bench_property_dispatch_1(bench_property_dispatch_0):
+    '''Properties: 100000 changes of a property with 1 observer'''
+
+    observers = 1
+
+
+class bench_property_dispatch_10(bench_property_dispatch_0):
+    '''Properties: 100000 changes of a property with 10 observers'''
+
+    observers = 10
+
+
+class bench_event_dispatch_0(bench_property_dispatch_0):
+    '''Events: 100000 dispatch of an event with 0 handler'''
+
+    def __init__(self):
+        self.obj = _DispatchBenchObject()
+        self.handlers = [_DispatchBenchObserver()
+                         for x in range(self.observers)]
+        for observer in self.handlers:
+            self.obj.bind(on_event=observer.callback)
+
+    def run(self):
+        dispatch = self.obj.dispatch
+        for x in range(100000):
+            dispatch('on_event')
+
+
+class bench_event_dispatch_1(bench_event_dispatch_0):
+    '''Events: 100000 dispatch of an event with 1 handler'''
+
+    observers = 1
+
+
+class bench_event_dispatch_10(bench_event_dispatch_0):
+    '''Events: 100000 dispatch of an event with 10 handlers'''
+
+    observers = 10
+
+
+class KvBenchWidget(Widget):
+    value = NumericProperty(0)
+
+
+Builder.load_string('''
+<KvBenchWidget>:
+    opacity: 1 if self.value % 2 else .5
+    size: self.value, self.value * 2
+    Widget:
+        id: child
+        pos: root.value, root.value + child.width
+''')
+
+
+class bench_kv_widget_creation:
+    '''Lang: creation (1000 KvBenchWidget with 4 kv bindings)'''
+
+    def run(self):
+        o = []
+        for x in range(1000):
+            o.append(KvBenchWidget())
+
+
+_kv_complex_rule = '''
+<{0}>:
+    opacity: 1 if self.value % 2 else .5
+    canvas:
+        Color:
+            rgba: 1, 1, 1, self.opacity
+        Rectangle:
+            pos: self.pos
+            size: self.size
+    Widget:
+        id: header
+        pos: root.x, root.top - self.height
+        size: root.width, 20
+        Widget:
+            id: icon
+            pos: header.pos
+            size: header.height, header.height
+        Widget:
+            pos: icon.right, header.y
+            size: header.width - icon.width, header.height
+    Widget:
+        id: body
+        pos: root.pos
+        size: root.width, root.height - header.height
+        on_touch_down: root.value += 1
+        Widget:
+            pos: body.x, body.y + root.value
+            size: body.width / 2., body.height
+        Widget:
+            pos: body.center_x, body.y
+            size: body.width / 2., body.height
+'''
+
+
+class KvComplexBenchWidget(Widget):
+    value = NumericProperty(0)
+
+
+class KvCompiledBenchWidget(Widget):
+    value = NumericProperty(0)
+
+
+Builder.load_string(_kv_complex_rule.format('KvComplexBenchWidget'))
+_kv_compiled = {'__name__': 'kv_compiled_bench'}
+exec(compile(compile_string(_kv_complex_rule.format('KvCompiledBenchWidget'),
+                            register=False), '<kv_compiled_bench>', 'exec'),
+     _kv_compiled)
+_kv_compiled['register'](Builder)
+
+
+class bench_kv_complex_creation:
+    '''Lang: creation (1000 widgets, 6 children, 16 exprs), Builder'''
+
+    widget_class = KvComplexBenchWidget
+
+    def run(self):
+        widget_class = self.widget_class
+        o = []
+        for x in range(1000):
+            o.append(widget_class())
+
+
+class bench_kv_complex_creation_compiled(bench_kv_complex_creation):
+    '''Lang: creation (1000 widgets, 6 children, 16 exprs), compiled'''
+
+    widget_class = KvCompiledBenchWidget
+
+
+class bench_kv_property_churn:
+    '''Lang: 10000 changes of a property with 3 kv expressions bound'''
+
+    def __init__(self):
+        self.widget = KvBenchWidget()
+
+    def run(self):
+        widget = self.widget
+        for x in range(10000):
+            widget.value = x
+
+
+class KvCanvasBenchWidget(Widget):
+    pass
+
+
+Builder.load_string('''
+<KvCanvasBenchWidget>:
+    canvas:
+        Color:
+            rgba: 1, 1, 1, self.x / 1000.
+        Rectangle:
+            pos: self.pos
+            size: self.size
+        Line:
+            rectangle: self.x, self.y, self.width, self.height
+''')
+
+
+class bench_kv_canvas_sync:
+    '''Lang: 1000 frames moving 100 widgets with canvas expressions'''
+
+    def __init__(self):
+        self.widgets = [KvCanvasBenchWidget() for x in range(100)]
+        Builder.sync()
+
+    def run(self):
+        widgets = self.widgets
+        sync = Builder.sync
+        for x in range(1000):
+            for widget in widgets:
+                widget.pos = x, x
+                widget.size = x + 10, x + 10
+            sync()
+
+
+class bench_kv_rules_match:
+    '''Lang: match 1000 widget classes with 500 rules loaded'''
+
+    def __init__(self):
+        self.builder = BuilderBase()
+        self.builder.load_string('\n'.join(
+            '<BenchRule%d>:\n    opacity: 1' % x for x in range(500)))
+        self.widgets = [type('BenchWidget%d' % x, (Widget, ), {})()
+                        for x in range(1000)]
+
+    def run(self):
+        match = self.builder.match
+        for widget in self.widgets:
+            match(widget)
+
+
+class bench_cache_purge_by_timeout:
+    '''Cache: 1000 timeout purges with 50000 objects cached'''
+
+    def __init__(self):
+        Cache.register('bench.cache', timeout=60)
+        for x in range(50000):
+            Cache.append('bench.cache', x, x)
+
+    def run(self):
+        try:
+            for x in range(1000):
+                Cache._purge_by_timeout(1)
+        finally:
+            Cache.remove('bench.cache')
+
+
+class bench_eventloop_cpu_busy:
+    '''EventLoop: CPU time of 1s of windowless main loop'''
+
+    idle_fps = 0
+
+    def __init__(self):
+        self.listener = Widget()
+        EventLoop.add_event_listener(self.listener)
+        Clock.schedule_interval(self.callback, .25)
+
+    def callback(self, dt):
+        pass
+
+    def run(self):
+        # return the CPU time used, the wall time is always 1s. This one needs
+        # the real time, to measure the sleeps.
+        idle_fps = Clock._idle_fps
+        Clock._idle_fps = self.idle_fps
+        Clock.disable_virtual_time()
+        start = process_time()
+        end = time() + 1.
+        try:
+            while time() < end:
+                EventLoop.idle()
+        finally:
+            Clock.enable_virtual_time()
+            Clock._idle_fps = idle_fps
+            Clock.unschedule(self.callback)
+            EventLoop.remove_event_listener(self.listener)
+        return process_time() - start
+
+
+class bench_eventloop_cpu_idle(bench_eventloop_cpu_busy):
+    '''EventLoop: CPU time of 1s of windowless main loop, idle_fps=2'''
+
+    idle_fps = 2
+
+
 if __name__ == '__main__':
 
     report = []
@@ -205,6 +556,9 @@ if __name__ == '__main__':
     log('Benchmark')
     log('---------')
 
+    # don't measure the sleeps done by the clock to respect maxfps
+    Clock.enable_virtual_time()
+
     for x in benchs:
         # clean cache to prevent weird case
         for cat in Cache._categories:
@@ -224,13 +578,19 @@ if __name__ == '__main__':
             traceback.print_exc()
             continue
 
+        events = ClockEventCounter()
         clock_start = clockfn()
 
         try:
             sys.stderr.write('.')
-            test.run()
+            with events:
+                ret = test.run()
             clock_end = clockfn() - clock_start
-            log('%.6f' % clock_end)
+            if ret is not None:
+                # the benchmark did its own measure (like CPU time)
+                clock_end = ret
+            # the clock events allocated during the run
+            log('%.6f %d events' % (clock_end, events.count))
         except Exception as e:
             log('failed %s' % str(e))
             continue
@@ -0,0 +1,324 @@
+'''
+Kv compiler
+===========
+
+.. versionadded:: 1.8.0
+
+This tool compiles the rules of a kv file into a Python module. Each rule
+becomes a plain function that creates the children, sets the properties and
+binds their dependencies directly, instead of being interpreted by the
+:class:`~kivy.lang.Builder` for every widget created. The compiled module
+registers its rules in the :class:`~kivy.lang.Builder` when it is imported,
+instead of loading the kv file::
+
+    python -m kivy.tools.kvcompiler myapp.kv [myapp_kv.py]
+
+Then, in your application::
+
+    import myapp_kv
+
+The compiled module must be generated again each time the kv file or Kivy
+is modified.
+
+Limitations
+-----------
+
+Only the rules are compiled: a kv file having templates (`[Name@Base]:`) or
+a root widget can't be compiled, and the compiler stops with an error. This
+excludes `kivy/data/style.kv`, which declares templates, and most of the kv
+files of the examples, which declare their root widget. Such files must still
+be loaded with :meth:`~kivy.lang.BuilderBase.load_file`. A common workaround
+for a root widget is to move it in a rule of its own class, and to create it
+from Python.
+
+The names set by `#:set` and `#:import` in other kv files are visible in the
+compiled rules only if these files are loaded before the compiled module is
+imported. The variables assigned in the handlers, like `on_press: x = 1`, are
+local to the handler.
+'''
+
+__all__ = ('compile_file', 'compile_string', 'KvCompilerException')
+
+import sys
+from types import CodeType
+from kivy.lang import Parser, ParserSelectorName, ParserSelectorClass, \
+    ParserSelectorId
+
+
+class KvCompilerException(Exception):
+    '''Exception raised when a kv file can't be compiled.
+    '''
+    pass
+
+
+class RuleCompiler(object):
+    # generate the function applying one root rule
+
+    def __init__(self, compiler, rule, index):
+        self.compiler = compiler
+        self.rule = rule
+        self.index = index
+        self.lines = []
+        self.count = 0
+        self.ids = set()
+        self.sets = []
+        self.handlers = []
+
+    def new_name(self, prefix):
+        self.count += 1
+        return '_kv%s%d' % (prefix, self.count)
+
+    def emit(self, line, indent=1):
+        self.lines.append('    ' * indent + line)
+
+    def emit_location(self, rule, indent=1):
+        self.emit('# %s:%d' % (self.compiler.filename, rule.line + 1),
+                  indent)
+
+    def collect_ids(self, rule):
+        if rule.id:
+            self.ids.add(rule.id.split('#', 1)[0].strip())
+        for child in rule.children:
+            self.collect_ids(child)
+
+    def compile(self):
+        name = '_kv_apply_%d' % self.index
+        self.collect_ids(self.rule)
+        self.emit_location(self.rule, 0)
+        self.emit('def %s(_kvbuilder, _kvroot):' % name, 0)
+        self.emit('root = _kvroot.proxy_ref')
+        self.compile_rule(self.rule, '_kvroot', 'root', True)
+
+        # properties are set once the whole tree is created, last rule first
+        for proxy, rule in reversed(self.sets):
+            for prop in rule.properties.values():
+                self.compile_property(proxy, proxy, prop)
+        for proxy, rule in self.handlers:
+            for prop in rule.handlers:
+                self.compile_handler(proxy, prop)
+        self.lines.append('')
+        return name, self.lines
+
+    def compile_rule(self, rule, widget, proxy, is_root):
+        if rule.id:
+            rule_id = rule.id.split('#', 1)[0].strip()
+            self.emit('%s = %s' % (rule_id, proxy))
+            if not is_root:
+                self.emit('_kvids = root.ids')
+                self.emit('_kvids[%r] = %s' % (rule_id, rule_id))
+                self.emit('root.ids = _kvids')
+
+        if rule.properties:
+            marked = self.compiler.new_global('[]')
+            self.emit('compiled_create_missing(%s, %s, %r)' % (
+                marked, widget, tuple(rule.properties.keys())))
+
+        for attr, canvas in (('canvas_before', 'canvas.before'),
+                             ('canvas_root', 'canvas'),
+                             ('canvas_after', 'canvas.after')):
+            crule = getattr(rule, attr)
+            if crule is not None:
+                self.compile_canvas(crule, widget, proxy, canvas)
+
+        for crule in rule.children:
+            child = self.new_name('o')
+            child_proxy = self.new_name('w')
+            self.emit_location(crule)
+            self.emit('%s = compiled_create(_kvctx, %d, %r)' % (
+                child, crule.line, crule.name))
+            self.emit('%s.add_widget(%s)' % (widget, child))
+            self.emit('_kvbuilder.apply(%s)' % child)
+            self.emit('%s = %s.proxy_ref' % (child_proxy, child))
+            self.compile_rule(crule, child, child_proxy, False)
+
+        if rule.properties:
+            self.sets.append((proxy, rule))
+        if rule.handlers:
+            self.handlers.append((proxy, rule))
+
+    def compile_canvas(self, rule, widget, proxy, canvas):
+        canvas_name = self.new_name('c')
+        self.emit('%s = %s.%s' % (canvas_name, widget, canvas))
+        self.emit('with %s:' % canvas_name)
+        if not rule.children:
+            self.emit('pass', 2)
+        for crule in rule.children:
+            self.emit_location(crule, 2)
+            if crule.name == 'Clear':
+                self.emit('%s.clear()' % canvas_name, 2)
+                continue
+            instr = self.new_name('i')
+            self.emit('%s = compiled_instruction(_kvctx, %d, %r).proxy_ref' % (
+                instr, crule.line, crule.name), 2)
+            for prop in crule.properties.values():
+                self.compile_property(proxy, instr, prop, True, 2)
+
+    def compile_property(self, proxy, element, prop, delayed=False,
+                         indent=1):
+        self.emit_location(prop, indent)
+        if type(prop.co_value) is not CodeType:
+            value = self.compiler.new_global('(%s)' % prop.value)
+            self.emit('%s.%s = %s' % (element, prop.name, value), indent)
+            return
+
+        fn = self.new_name('f')
+        self.emit('def %s(*largs):' % fn, indent)
+        self.emit('self = %s' % proxy, indent + 1)
+        self.emit('%s.%s = (' % (element, prop.name), indent + 1)
+        self.lines.append(prop.value)
+        self.lines.append(')')
+        handler = fn
+        if delayed:
+            handler = self.new_name('d')
+            self.emit('%s = compiled_delayed(%s)' % (handler, fn), indent)
+        for key in prop.watched_keys or []:
+            self.emit('compiled_bind(%s, %s, %s, %r)' % (
+                proxy, handler, self.resolve(key[0], proxy), tuple(key)),
+                indent)
+        self.emit('%s()' % fn, indent)
+
+    def compile_handler(self, proxy, prop):
+        self.emit_location(prop)
+        fn = self.new_name('h')
+        self.emit('def %s(*args, **kwargs):' % fn)
+        self.emit('self = %s' % proxy, 2)
+        for line in prop.value.splitlines():
+            self.emit(line.strip(), 2)
+        self.emit('compiled_bind_handler(%s, %r, %s)' % (
+            proxy, prop.name, fn))
+
+    def resolve(self, name, proxy):
+        # return the code to get the value of a name in an expression
+        if name == 'self':
+            return proxy
+        if name == 'root' or name in self.ids:
+            return name
+        return '_kvglobals.get(%r)' % name
+
+
+class KvCompiler(object):
+    # generate the module of a kv file
+
+    def __init__(self, parser, filename):
+        self.parser = parser
+        self.filename = filename
+        self.globals = []
+
+    def new_global(self, value):
+        name = '_kvk%d' % len(self.globals)
+        self.globals.append('%s = %s' % (name, value))
+        return name
+
+    def compile(self, register=True):
+        parser = self.parser
+        if parser.templates:
+            raise KvCompilerException(
+                'Templates are not supported by the compiler')
+        if parser.root is not None:
+            raise KvCompilerException(
+                'A root widget is not supported by the compiler')
+
+        # the root rules, and their selectors
+        rules = []
+        for selector, rule in parser.rules:
+            if isinstance(selector, ParserSelectorName):
+                kind = 'name'
+            elif isinstance(selector, ParserSelectorClass):
+                kind = 'class'
+            elif isinstance(selector, ParserSelectorId):
+                kind = 'id'
+            if not rules or rules[-1][0] is not rule:
+                rules.append((rule, []))
+            rules[-1][1].append((kind, selector.key))
+
+        functions = []
+        entries = []
+        for index, (rule, selectors) in enumerate(rules):
+            name, lines = RuleCompiler(self, rule, index).compile()
+            functions.extend(lines)
+            entries.append('    (%r, %r, %s),' % (
+                rule.avoid_previous_rules, selectors, name))
+
+        lines = [
+            '# -*- coding: utf-8 -*-',
+            "'''",
+            'Rules of %s, compiled by kivy.tools.kvcompiler.' % self.filename,
+            "Don't edit this file, compile the kv file again instead.",
+            "'''",
+            '',
+            'from kivy.lang import Builder, global_idmap, \\',
+            '    compiled_context, compiled_execute_directives, \\',
+            '    compiled_create, compiled_instruction, \\',
+            '    compiled_create_missing, compiled_delayed, compiled_bind, \\',
+            '    compiled_bind_handler',
+            '',
+            '_kvctx = compiled_context(%r)' % self.filename,
+            'compiled_execute_directives(_kvctx, %r)' % (parser.directives, ),
+            '',
+            '# the names of the kv expressions',
+            'globals().update(global_idmap)',
+            '_kvglobals = globals()',
+            '']
+        lines += self.globals
+        lines += ['', '']
+        lines += functions
+        lines += ['', '_kvrules = [']
+        lines += entries
+        lines += [']', '']
+        lines += ['_kvdynamic_classes = %r' % (parser.dynamic_classes, ), '']
+        lines += [
+            '',
+            'def register(builder):',
+            '    builder.load_compiled(_kvctx.filename, _kvrules, '
+            '_kvdynamic_classes)',
+            '']
+        if register:
+            lines += ['register(Builder)', '']
+        return '\n'.join(lines)
+
+
+def compile_string(content, filename='<string>', register=True):
+    '''Return the source code of the Python module compiled from the kv
+    `content`. The module has a `register(builder)` function to insert its
+    rules in a :class:`~kivy.lang.BuilderBase`. If `register` is True, the
+    rules are inserted in the :class:`~kivy.lang.Builder` when the module is
+    imported.
+    '''
+    parser = Parser(content=content, filename=filename)
+    return KvCompiler(parser, filename).compile(register)
+
+
+def compile_file(filename, register=True):
+    '''Same as :func:`compile_string`, for the content of the kv file
+    `filename`.
+    '''
+    with open(filename, 'r') as fd:
+        content = fd.read()
+    return compile_string(content, filename, register)
+
+
+def main(args):
+    if len(args) not in (1, 2):
+        print('Usage: python -m kivy.tools.kvcompiler <file.kv> '
+              '[<output.py>]')
+        return 1
+    filename = args[0]
+    if len(args) == 2:
+        output = args[1]
+    else:
+        output = filename.rsplit('.', 1)[0] + '_kv.py'
+    try:
+        source = compile_file(filename)
+    except KvCompilerException as e:
+        print('Error: %s' % e)
+        print('Only the rules of a kv file can be compiled, load %s with '
+              'Builder.load_file() instead.' % filename)
+        return 1
+    with open(output, 'w') as fd:
+        fd.write(source)
+    print('Compiled %s into %s' % (filename, output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
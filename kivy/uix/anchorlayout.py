@@ -102,9 +102,11 @@ class AnchorLayout(Layout):
             if anchor_y == 'center':
                 y = y + (height / 2) - (h / 2)
 
-            c.x = x
-            c.y = y
-            c.width = w
-            c.height = h
+            # dispatch pos and size once
+            with c.batch_update():
+                c.x = x
+                c.y = y
+                c.width = w
+                c.height = h
 
         self.size = (width, height)  # might have changed inside loop
@@ -170,10 +170,12 @@ class BoxLayout(Layout):
                     elif key == 'center_y':
                         cy += padding_bottom - h / 2. + posy
 
-                c.x = cx
-                c.y = cy
-                c.width = w
-                c.height = h
+                # dispatch pos and size once
+                with c.batch_update():
+                    c.x = cx
+                    c.y = cy
+                    c.width = w
+                    c.height = h
                 x += w + spacing
 
         if orientation == 'vertical':
@@ -201,10 +203,12 @@ class BoxLayout(Layout):
                     elif key == 'center_x':
                         cx += padding_left - w / 2. + posx
 
-                c.x = cx
-                c.y = cy
-                c.width = w
-                c.height = h
+                # dispatch pos and size once
+                with c.batch_update():
+                    c.x = cx
+                    c.y = cy
+                    c.width = w
+                    c.height = h
                 y += h + spacing
 
     def add_widget(self, widget, index=0):
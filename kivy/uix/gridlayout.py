@@ -433,10 +433,12 @@ class GridLayout(Layout):
                 if i < 0:
                     break
                 c = children[i]
-                c.x = x
-                c.y = y - row_height
-                c.width = col_width
-                c.height = row_height
+                # dispatch pos and size once
+                with c.batch_update():
+                    c.x = x
+                    c.y = y - row_height
+                    c.width = col_width
+                    c.height = row_height
                 i = i - 1
                 x = x + col_width + spacing_x
             y -= row_height + spacing_y
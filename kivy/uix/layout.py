@@ -67,6 +67,14 @@ class Layout(Widget):
         If you are writing a new Layout subclass, don't call this function
         directly but use :meth:`_trigger_layout` instead.
 
+        When several properties of a child are changed, do it within
+        :meth:`~kivy.event.EventDispatcher.batch_update` to dispatch each of
+        them only once::
+
+            with child.batch_update():
+                child.pos = x, y
+                child.size = width, height
+
         .. versionadded:: 1.0.8
         '''
         pass
@@ -39,15 +39,24 @@ if sys.version > '3':
             method.
             Returns None if the original object doesn't exist
             '''
-            if self.proxy:
-                return getattr(self.proxy, self.method_name)
-            return self.method
+            proxy = self.proxy
+            if proxy is None:
+                return self.method
+            try:
+                return getattr(proxy, self.method_name)
+            except ReferenceError:
+                return None
 
         def is_dead(self):
             '''Returns True if the referenced callable was a bound method and
             the instance no longer exists. Otherwise, return False.
             '''
-            return self.proxy is not None and not bool(dir(self.proxy))
+            if self.proxy is None:
+                return False
+            try:
+                return not bool(dir(self.proxy))
+            except ReferenceError:
+                return True
 
         def __repr__(self):
             return '<WeakMethod proxy={} method={} method_name={}>'.format(
@@ -83,13 +92,14 @@ else:
             method.
             Returns None if the original object doesn't exist
             '''
-            if self.is_dead():
-                return None
-            if self._obj is not None:
-                return new.instancemethod(self._func, self._obj(), self._class)
-            else:
+            obj = self._obj
+            if obj is None:
                 # we don't have an instance: return just the function
                 return self._func
+            obj = obj()
+            if obj is None:
+                return None
+            return new.instancemethod(self._func, obj, self._class)
 
         def is_dead(self):
             '''Returns True if the referenced callable was a bound method and